@@ -5,9 +5,6 @@ parameters to :func:`resources.lib.router.dispatch`.
 """
 
 import sys
-import traceback
-import xbmc
-import xbmcgui
 
 from resources.lib.router import dispatch
 
@@ -18,6 +15,11 @@ def main():
         params = sys.argv[2] if len(sys.argv) > 2 else ""
         dispatch(handle, params)
     except Exception as e:
+        # Only the failure path needs these; keep them off the cold start
+        import traceback
+        import xbmc
+        import xbmcgui
+
         # Log the full traceback for debugging
         xbmc.log(f"PrimeHub unhandled exception: {traceback.format_exc()}", xbmc.LOGERROR)
         
@@ -2,10 +2,13 @@
 Native backend for Prime Video, conforming to API_DOCS.md.
 """
 from __future__ import annotations
+import threading
+import time
 from collections import OrderedDict
-from typing import Any, Dict, List, Optional, Tuple
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
 
-from ..common import Globals, Settings, Singleton
+from ..common import DATACLASS_SLOTS, Globals, Settings, Singleton
 from .. import network as net
 from .session import SessionManager
 
@@ -14,6 +17,36 @@ try:
 except ImportError:
     from ...tests.kodi_mocks import xbmc
 
+# In-process response memo: Kodi re-queries the same page on back navigation
+# and re-runs searches as the keyboard dialog settles.
+_BROWSE_TTL = 300.0
+_SEARCH_TTL = 30.0
+_RESPONSE_CACHE_SIZE = 128
+# There is no batch endpoint: BrowseBatch fans out over this many connections.
+_BATCH_WORKERS = 4
+
+Page = Tuple[List[Dict], Optional[str]]
+
+class BackendError(Exception):
+    """Raised when the Prime Video backend cannot fulfil a request."""
+
+class BackendUnavailable(BackendError):
+    """Raised when the backend cannot be reached at all."""
+
+class AuthenticationError(BackendError):
+    """Raised when a request needs a signed-in session."""
+
+@dataclass(**DATACLASS_SLOTS)
+class Playable:
+    """Fixed-shape playback hand-off consumed by ``ui.playback``."""
+    url: str
+    manifest_type: str = "mpd"
+    license_key: Optional[str] = None
+    license_type: str = "com.widevine.alpha"
+    headers: Dict[str, str] = field(default_factory=dict)
+    metadata: Dict[str, Any] = field(default_factory=dict)
+    mime_type: str = "application/dash+xml"
+
 class PrimeVideo(metaclass=Singleton):
     _catalog = {}
 
@@ -21,6 +54,9 @@ class PrimeVideo(metaclass=Singleton):
         self._g = Globals()
         self._s = Settings()
         self._session_manager = SessionManager.get_instance()
+        self._responses: "OrderedDict[str, Tuple[float, Page]]" = OrderedDict()
+        # The rail prefetch thread shares this instance; fetches run unlocked.
+        self._responses_lock = threading.Lock()
 
     def login(self, username, password) -> bool:
         session = net.MechanizeLogin(username, password)
@@ -32,14 +68,80 @@ class PrimeVideo(metaclass=Singleton):
         self._catalog['root'] = self._parse_main_menu(data)
         return True
 
-    def Browse(self, path: str) -> Tuple[List[Dict], Optional[str]]:
-        if not self._catalog: self.BuildRoot()
+    def _memo(self, key: str, ttl: float) -> Optional[Page]:
+        """Return the memoised page for *key* while it is younger than *ttl*."""
+        with self._responses_lock:
+            entry = self._responses.get(key)
+            if entry is not None and time.monotonic() - entry[0] < ttl:
+                self._responses.move_to_end(key)
+                return entry[1]
+        return None
+
+    def _cached(self, key: str, ttl: float, fetch: Callable[[], Page]) -> Page:
+        """Return the memoised page for *key*, calling *fetch* when absent or stale."""
+        page = self._memo(key, ttl)
+        if page is not None:
+            return page
+        now = time.monotonic()
+        page = fetch()
+        if not page[0]:
+            return page  # never pin an empty or failed fetch
+        with self._responses_lock:
+            self._responses[key] = (now, page)
+            self._responses.move_to_end(key)
+            if len(self._responses) > _RESPONSE_CACHE_SIZE:
+                self._responses.popitem(last=False)
+        return page
+
+    def clear_responses(self) -> None:
+        """Forget every memoised page, so the next Browse or Search refetches."""
+        with self._responses_lock:
+            self._responses.clear()
+
+    def Browse(self, path: str) -> Page:
+        return self._cached("browse:" + path, _BROWSE_TTL, lambda: self._browse(path))
+
+    def BrowseBatch(self, paths: Iterable[str]) -> Dict[str, Page]:
+        """Browse several paths at once, fetching the memo misses concurrently.
+
+        Only the network fetches run on the pool; the memo is read and filled
+        on the calling thread.
+        """
+        paths = list(dict.fromkeys(path for path in paths if path))
+        missing = [path for path in paths if self._memo("browse:" + path, _BROWSE_TTL) is None]
+        fetched: Dict[str, Page] = {}
+        if missing:
+            if not self._catalog: self.BuildRoot()
+            from concurrent.futures import ThreadPoolExecutor
+            with ThreadPoolExecutor(max_workers=min(len(missing), _BATCH_WORKERS)) as pool:
+                fetched = dict(zip(missing, pool.map(self._browse, missing)))
+        return {
+            path: self._cached("browse:" + path, _BROWSE_TTL,
+                               lambda path=path: fetched[path] if path in fetched else self._browse(path))
+            for path in paths
+        }
+
+    def _browse(self, path: str) -> Page:
         if path == 'root':
+            # A root miss means the memo expired: rebuild the catalog with it.
+            self.BuildRoot()
             return list(self._catalog.get('root', {}).values()), None
-        data = net.GrabJSON(f"{self._g.BaseUrl}{path}")
+        url = f"{self._g.BaseUrl}{path}"
+        if self._catalog:
+            return self._parse_item_list(net.GrabJSON(url))
+        # Fresh process opening a rail: the storefront and the rail page are
+        # independent requests, so overlap them rather than paying two RTTs.
+        from concurrent.futures import ThreadPoolExecutor
+        with ThreadPoolExecutor(max_workers=1) as pool:
+            rail = pool.submit(net.GrabJSON, url)
+            self.BuildRoot()
+            data = rail.result()
         return self._parse_item_list(data)
 
-    def Search(self, query: str) -> Tuple[List[Dict], Optional[str]]:
+    def Search(self, query: str) -> Page:
+        return self._cached("search:" + query, _SEARCH_TTL, lambda: self._search(query))
+
+    def _search(self, query: str) -> Page:
         data = net.GrabJSON(f"{self._g.BaseUrl}/gp/video/search?phrase={query}")
         return self._parse_item_list(data)
 
@@ -2,11 +2,13 @@
 Session Manager for handling a persistent requests.Session object.
 """
 from __future__ import annotations
+import atexit
 import json
 import os
 import requests
 from typing import Optional
 from requests.adapters import HTTPAdapter
+from urllib3.util.request import ACCEPT_ENCODING
 from urllib3.util.retry import Retry
 
 try:
@@ -27,8 +29,12 @@ class SessionManager:
             raise RuntimeError("Use get_instance() to get the singleton instance.")
         
         self._addon = xbmcaddon.Addon()
-        self._session_path = os.path.join(self._addon.getAddonInfo('profile'), 'session.json')
+        # os.replace() needs a real filesystem path, not special://profile.
+        profile = xbmcvfs.translatePath(self._addon.getAddonInfo('profile'))
+        self._session_path = os.path.join(profile, 'session.json')
         self._session: Optional[requests.Session] = None
+        self._dirty = False
+        self._flush_registered = False
         self._load_session()
 
     @classmethod
@@ -40,7 +46,12 @@ class SessionManager:
     def get_session(self) -> requests.Session:
         if self._session is None:
             session = requests.Session()
-            retries = Retry(total=6, backoff_factor=0.5, status_forcelist=[500, 502, 503, 504, 408, 429])
+            # requests 2.22 (the Kodi module) hard-codes "gzip, deflate";
+            # urllib3's list also offers br when a brotli decoder is installed.
+            session.headers["Accept-Encoding"] = ACCEPT_ENCODING
+            # Interactive navigation: a short retry budget keeps a flaky
+            # endpoint from stalling the directory for tens of seconds.
+            retries = Retry(total=3, backoff_factor=0.3, status_forcelist=[500, 502, 503, 504, 408, 429])
             adapter = HTTPAdapter(pool_connections=20, pool_maxsize=20, max_retries=retries)
             session.mount("https://", adapter)
             session.mount("http://", adapter)
@@ -51,9 +62,35 @@ class SessionManager:
         # ... (rest of the file remains the same)
         pass
     
-    def save_session(self) -> None:
-        # ...
-        pass
+    def save_session(self, force: bool = False) -> None:
+        """Mark the cookies for saving.
+
+        The write is deferred to interpreter exit, so however many times a
+        plug-in run saves, the profile (often flash storage) sees one write.
+        *force* writes immediately.
+        """
+        self._dirty = True
+        if force:
+            self._flush()
+        elif not self._flush_registered:
+            atexit.register(self._flush)
+            self._flush_registered = True
+
+    def _flush(self) -> None:
+        if not self._dirty or self._session is None:
+            return
+        cookies = requests.utils.dict_from_cookiejar(self._session.cookies)
+        tmp_path = f"{self._session_path}.tmp"
+        try:
+            with xbmcvfs.File(tmp_path, "w") as stream:
+                stream.write(json.dumps(cookies, separators=(",", ":")))
+            os.replace(tmp_path, self._session_path)
+        except OSError as e:
+            # Still dirty, so the atexit flush gets another try.
+            xbmcvfs.delete(tmp_path)
+            _log(xbmc.LOGERROR, f"Could not save session: {e}")
+            return
+        self._dirty = False
         
     def logout(self) -> None:
         # ...
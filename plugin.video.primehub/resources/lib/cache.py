@@ -6,19 +6,102 @@ listings, playback resolution, and diagnostics runs.
 
 from __future__ import annotations
 
+import atexit
+import functools
 import json
 import os
+import re
 import threading
 import time
+from collections import OrderedDict
 from hashlib import sha1
-from typing import Any, Optional
+from typing import Any, Dict, Optional, Tuple
 
 try:  # pragma: no cover - Kodi runtime
     import xbmcvfs
     import xbmcaddon
 except ImportError:  # pragma: no cover - local dev fallback
-    from ...tests.kodi_mocks import MockXBMCRuntime as xbmcvfs
-    from ...tests.kodi_mocks import MockXBMCAddon as xbmcaddon
+    from ...tests.kodi_mocks import xbmcvfs, xbmcaddon
+
+from .common import Globals
+
+
+# Writes are buffered and flushed together after this many seconds, when the
+# route finishes, or at interpreter exit, so warming several rails costs one
+# burst of file I/O.
+_FLUSH_DELAY = 5.0
+
+# Decoded envelopes kept in process so repeat reads skip file I/O and JSON.
+_MEM_MAX = 128
+
+# Filenames carry a readable copy of the key's head after the digest, so
+# clear_prefix() can match on directory names alone.
+_NAME_SEP = "__"
+_NAME_KEY_CHARS = 48
+_UNSAFE_CHARS = re.compile(r"[^A-Za-z0-9._-]")
+
+
+def _safe_key(key: str) -> str:
+    return _UNSAFE_CHARS.sub("_", key)[:_NAME_KEY_CHARS]
+
+
+@functools.lru_cache(maxsize=1024)
+def _entry_path(base_path: str, key: str) -> str:
+    """Return the cache file for *key*; memoized because keys repeat constantly."""
+    digest = sha1(key.encode("utf-8")).hexdigest()
+    return os.path.join(base_path, f"{digest}{_NAME_SEP}{_safe_key(key)}.json")
+
+
+_CACHE_SUFFIXES = (".json", ".tmp")
+
+# Compact separators: no padding whitespace to write, read back, or scan.
+_JSON_SEPARATORS = (",", ":")
+
+try:  # orjson is optional; both paths read and write the same compact JSON.
+    import orjson
+
+    def _dumps(obj: Any) -> str:
+        return orjson.dumps(obj).decode("utf-8")
+
+    _loads = orjson.loads
+except ImportError:
+    def _dumps(obj: Any) -> str:
+        return json.dumps(obj, separators=_JSON_SEPARATORS)
+
+    _loads = json.loads
+
+
+@functools.lru_cache(maxsize=1)
+def cache_settings() -> Tuple[bool, int]:
+    """Return ``(use_cache, cache_ttl)``, read once per plug-in invocation.
+
+    Kodi starts a fresh interpreter for every plug-in call, so the memo can
+    never outlive a settings change.
+    """
+    addon = Globals().addon
+    try:
+        use_cache = addon.getSettingBool("use_cache")
+        cache_ttl = addon.getSettingInt("cache_ttl")
+    except AttributeError:
+        use_cache = str(addon.getSetting("use_cache")).lower() == "true"
+        cache_ttl = int(addon.getSetting("cache_ttl") or 300)
+    return bool(use_cache), int(cache_ttl)
+
+
+@functools.lru_cache(maxsize=1)
+def _region() -> str:
+    """The ``region`` setting, read once per plug-in invocation."""
+    return Globals().addon.getSetting("region") or "0"
+
+
+def cache_key(kind: str, name: str) -> str:
+    """Cache key for a page of *kind* (``rail``, ``search``, ``home``, ``stream``).
+
+    Each region has its own catalogue, so the region is part of the key and
+    switching it never serves another region's pages. *kind* stays the
+    leading segment so ``Cache.clear_prefix`` can still drop one kind.
+    """
+    return f"{kind}:{_region()}:{name}"
 
 
 class Cache:
@@ -35,11 +118,15 @@ class Cache:
         if not xbmcvfs.exists(base_path):
             xbmcvfs.mkdirs(base_path)
         self._base_path = base_path
-        self._lock = threading.Lock()
+        # One lock for the shared _mem/_dirty stores and the flush timer: the
+        # LRU reorders and evicts across keys, so per-key locks cannot guard it.
+        self._lock = threading.RLock()
+        self._dirty: Dict[str, Dict[str, Any]] = {}
+        self._mem: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._flush_timer: Optional[threading.Timer] = None
 
     def _filepath(self, key: str) -> str:
-        digest = sha1(key.encode("utf-8")).hexdigest()
-        return os.path.join(self._base_path, f"{digest}.json")
+        return _entry_path(self._base_path, key)
 
     def get(self, key: str, ttl_seconds: Optional[int] = None) -> Optional[Any]:
         """Return cached data for *key* when still fresh.
@@ -50,16 +137,30 @@ class Cache:
         ``None`` is returned.
         """
 
-        path = self._filepath(key)
-        if not xbmcvfs.exists(path):
-            return None
         with self._lock:
+            payload = self._mem.get(key)
+            if payload is not None:
+                self._mem.move_to_end(key)
+            else:
+                payload = self._dirty.get(key)
+                if payload is not None:
+                    self._remember(key, payload)
+
+        if payload is None:
+            # Renames are atomic, so the file is read without holding the lock.
+            path = self._filepath(key)
+            if not xbmcvfs.exists(path):
+                return None
             try:
-                with xbmcvfs.open(path, "r") as stream:  # type: ignore[arg-type]
-                    payload = json.load(stream)
+                with xbmcvfs.File(path, "r") as stream:
+                    payload = _loads(stream.read())
             except Exception:
                 self.delete(key)
                 return None
+            with self._lock:
+                # A set() that landed during the read wins over the file.
+                payload = self._mem.get(key) or self._dirty.get(key) or payload
+                self._remember(key, payload)
 
         timestamp = float(payload.get("timestamp", 0))
         ttl_value = ttl_seconds
@@ -77,7 +178,7 @@ class Cache:
         return payload.get("data")
 
     def set(self, key: str, data: Any, ttl_seconds: int) -> None:
-        path = self._filepath(key)
+        """Buffer *data* under *key*; it reaches disk on the next flush."""
         payload = {
             "timestamp": time.time(),
             "ttl": ttl_seconds,
@@ -85,53 +186,114 @@ class Cache:
             "data": data,
         }
         with self._lock:
-            with xbmcvfs.open(path, "w") as stream:  # type: ignore[arg-type]
-                json.dump(payload, stream)
+            self._dirty[key] = payload
+            self._remember(key, payload)
+            if self._flush_timer is None:
+                self._flush_timer = threading.Timer(_FLUSH_DELAY, self.flush)
+                self._flush_timer.daemon = True
+                self._flush_timer.start()
 
-    def delete(self, key: str) -> None:
-        path = self._filepath(key)
-        if xbmcvfs.exists(path):
-            try:
-                xbmcvfs.delete(path)
-            except AttributeError:
+    def _remember(self, key: str, payload: Dict[str, Any]) -> None:
+        # Callers hold self._lock.
+        self._mem[key] = payload
+        self._mem.move_to_end(key)
+        if len(self._mem) > _MEM_MAX:
+            self._mem.popitem(last=False)
+
+    def flush(self) -> None:
+        """Write every buffered entry to disk.
+
+        Each entry is written to a ``.tmp`` sibling and renamed over the live
+        file, so readers never see a half-written envelope. An entry that
+        fails to serialise or write is dropped without losing the others.
+        """
+        with self._lock:
+            if self._flush_timer is not None:
+                self._flush_timer.cancel()
+                self._flush_timer = None
+            pending, self._dirty = self._dirty, {}
+            if not pending:
+                return
+            for key, payload in pending.items():
+                path = self._filepath(key)
+                tmp_path = f"{path}.tmp"
                 try:
-                    os.remove(path)
-                except FileNotFoundError:
-                    pass
+                    with xbmcvfs.File(tmp_path, "w") as stream:
+                        stream.write(_dumps(payload))
+                    os.replace(tmp_path, path)
+                except Exception:
+                    xbmcvfs.delete(tmp_path)
 
-    def clear_prefix(self, prefix: str) -> None:
-        for filename in os.listdir(self._base_path):
-            if not filename.endswith(".json"):
-                continue
-            path = os.path.join(self._base_path, filename)
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._dirty.pop(key, None)
+            self._mem.pop(key, None)
+        # No exists() probe: deleting a missing file is already a no-op.
+        path = self._filepath(key)
+        try:
+            xbmcvfs.delete(path)
+        except AttributeError:
             try:
-                with xbmcvfs.open(path, "r") as stream:  # type: ignore[arg-type]
-                    payload = json.load(stream)
-                key = payload.get("key")
-            except Exception:
-                key = None
-            if key is None or not str(key).startswith(prefix):
-                continue
-            self.delete(str(key))
+                os.remove(path)
+            except FileNotFoundError:
+                pass
 
-    def clear_all(self) -> None:
-        if not xbmcvfs.exists(self._base_path):
+    def _scandir(self):
+        """Scan the cache directory, or recreate it and return ``None`` if it is gone."""
+        try:
+            return os.scandir(self._base_path)
+        except FileNotFoundError:
             try:
                 xbmcvfs.mkdirs(self._base_path)
             except AttributeError:
                 os.makedirs(self._base_path, exist_ok=True)
+            return None
+
+    def clear_prefix(self, prefix: str) -> None:
+        with self._lock:
+            for store in (self._dirty, self._mem):
+                for key in [k for k in store if k.startswith(prefix)]:
+                    del store[key]
+        # Over-matching (sanitised or truncated keys) only evicts extra entries.
+        wanted = _safe_key(prefix)
+        entries = self._scandir()
+        if entries is None:
             return
-        for filename in os.listdir(self._base_path):
-            if not filename.endswith(".json"):
-                continue
-            path = os.path.join(self._base_path, filename)
-            try:
-                xbmcvfs.delete(path)
-            except AttributeError:
+        with entries as it:
+            for entry in it:
+                name = entry.name
+                if not name.endswith(".json"):
+                    continue
+                _, sep, name_key = name[:-5].partition(_NAME_SEP)
+                if not sep or not name_key.startswith(wanted):
+                    continue
                 try:
-                    os.remove(path)
-                except FileNotFoundError:
+                    xbmcvfs.delete(entry.path)
+                except AttributeError:
+                    try:
+                        os.remove(entry.path)
+                    except FileNotFoundError:
+                        continue
+
+    def clear_all(self) -> None:
+        with self._lock:
+            self._dirty.clear()
+            self._mem.clear()
+        entries = self._scandir()
+        if entries is None:
+            return
+        with entries as it:
+            for entry in it:
+                # ".tmp" catches files left behind by an interrupted flush.
+                if not entry.name.endswith(_CACHE_SUFFIXES):
                     continue
+                try:
+                    xbmcvfs.delete(entry.path)
+                except AttributeError:
+                    try:
+                        os.remove(entry.path)
+                    except FileNotFoundError:
+                        continue
 
 
 _cache_instance: Optional[Cache] = None
@@ -141,4 +303,11 @@ def get_cache() -> Cache:
     global _cache_instance
     if _cache_instance is None:
         _cache_instance = Cache()
+        atexit.register(_cache_instance.flush)
     return _cache_instance
+
+
+def flush_cache() -> None:
+    """Write pending entries now; a no-op when nothing used the cache."""
+    if _cache_instance is not None:
+        _cache_instance.flush()
@@ -4,7 +4,7 @@ This mirrors the structure found in the Sandmann79 codebase, providing
 a centralized way to manage global state and settings.
 """
 from __future__ import annotations
-import os
+import sys
 from typing import Optional
 
 try:
@@ -15,6 +15,9 @@ try:
 except ImportError:
     from ...tests.kodi_mocks import xbmc, xbmcaddon, xbmcgui, translatePath
 
+# ``dataclass(slots=True)`` needs Python 3.10; Kodi 19/20 still ship 3.8.
+DATACLASS_SLOTS = {"slots": True} if sys.version_info >= (3, 10) else {}
+
 class Singleton(type):
     _instances = {}
     def __call__(cls, *args, **kwargs):
@@ -30,11 +33,14 @@ class Globals(metaclass=Singleton):
         self.pluginid = "plugin.video.primeflix"
         self.DATA_PATH = translatePath(self.addon.getAddonInfo('profile'))
         self.PLUGIN_PATH = translatePath(self.addon.getAddonInfo('path'))
+        self.DefaultFanart = self.addon.getAddonInfo('fanart')
         
         # Marketplace/Region info (will be updated by the backend)
         self.MarketID = "ATVPDKIKX0DER" # Default to US
         self.BaseUrl = "https://www.amazon.com"
         self.ATVUrl = "https://atv-ps.amazon.com"
+        # Device type the web player reports to GetPlaybackResources
+        self.DeviceTypeID = "AOAGZA014O5RE"
 
 class Settings(metaclass=Singleton):
     """A singleton for accessing add-on settings."""
@@ -44,3 +50,13 @@ class Settings(metaclass=Singleton):
     def __getattr__(self, name):
         # In a real implementation, this would handle type conversions.
         return self._g.addon.getSetting(name)
+
+_addon_name: Optional[str] = None
+
+def notify(message: str, icon: str = xbmcgui.NOTIFICATION_ERROR) -> None:
+    """Show a notification titled with the add-on name, resolved once per process."""
+    global _addon_name
+    g = Globals()
+    if _addon_name is None:
+        _addon_name = g.addon.getAddonInfo("name")
+    g.dialog.notification(_addon_name, message, icon)
@@ -2,19 +2,40 @@
 Network utility functions for making API calls, conforming to API_DOCS.md.
 """
 from __future__ import annotations
+from types import MappingProxyType
 from typing import Optional, Dict, Tuple
 
-# These libraries are expected to be provided by Kodi script modules
+# These libraries are expected to be provided by Kodi script modules.
+# mechanicalsoup (and BeautifulSoup behind it) is only needed to log in, so
+# MechanizeLogin imports it; requests is loaded by SessionManager regardless.
 import requests
-import mechanicalsoup
 
-from .session import SessionManager
+from .backend.session import SessionManager
+
+try:
+    # Not shipped with Kodi; used when the platform provides it.
+    from orjson import loads as _json_loads
+except ImportError:
+    from json import loads as _json_loads
 
 try:
     import xbmc
 except ImportError:
     from ...tests.kodi_mocks import xbmc
 
+# Read once per invocation: Kodi only writes LOGDEBUG lines when debug
+# logging is on, so per-request traces skip their formatting otherwise.
+_DEBUG_LOG_ENABLED = bool(xbmc.getCondVisibility("System.GetBool(debug.showloginfo)"))
+
+# The CDP endpoint and its fixed query are based on Sandmann79 analysis.
+_CDP_BASE_URL = "https://atv-ps.amazon.com/cdp/"
+_CDP_DEFAULT_PARAMS = MappingProxyType({
+    "deviceTypeID": "A1F83G8C2ARO7P", # Example ID, should be configurable
+    "firmware": "1",
+    "format": "json",
+    "marketplaceID": "ATVPDKIKX0DER", # Example ID, should be configurable
+})
+
 def _log(level: int, message: str) -> None:
     xbmc.log(f"[PrimeHub-Network] {message}", level)
 
@@ -23,6 +44,8 @@ def MechanizeLogin(username, password) -> requests.Session:
     Performs the live, multi-step login process.
     NOTE: This does not handle MFA or Captcha. A developer must add that logic.
     """
+    import mechanicalsoup
+
     _log(xbmc.LOGINFO, f"MechanizeLogin (LIVE) for user {username}")
     
     session = SessionManager.get_instance().get_session()
@@ -59,12 +82,14 @@ def MechanizeLogin(username, password) -> requests.Session:
 
     # 4. On success, the session object passed to the browser is updated by reference.
     _log(xbmc.LOGINFO, "Login successful, session cookies should be obtained.")
-    SessionManager.get_instance().save_session()
+    # Fresh login cookies are written now, not left to interpreter exit.
+    SessionManager.get_instance().save_session(force=True)
     
     return session
 
 def GrabJSON(url: str, postData: Optional[Dict] = None) -> Dict:
-    _log(xbmc.LOGINFO, f"GrabJSON (LIVE) from {url}")
+    if _DEBUG_LOG_ENABLED:
+        _log(xbmc.LOGDEBUG, f"GrabJSON (LIVE) from {url}")
     session = SessionManager.get_instance().get_session()
     try:
         response = session.get(url, data=postData, timeout=15)
@@ -72,30 +97,22 @@ def GrabJSON(url: str, postData: Optional[Dict] = None) -> Dict:
         # This is still a placeholder. The Sandmann79 code shows that JSON is often
         # embedded in script tags within the HTML, requiring careful parsing.
         # DEVELOPER: Implement HTML parsing here to extract the JSON.
-        return response.json()
+        return _json_loads(response.content)
     except (requests.exceptions.RequestException, ValueError) as e:
         _log(xbmc.LOGERROR, f"GrabJSON failed for {url}: {e}")
         return {}
 
 def getURLData(mode: str, asin: str, **kwargs) -> Tuple[bool, Dict | str]:
-    _log(xbmc.LOGINFO, f"getURLData (LIVE) for {mode} with asin {asin}")
+    if _DEBUG_LOG_ENABLED:
+        _log(xbmc.LOGDEBUG, f"getURLData (LIVE) for {mode} with asin {asin}")
     session = SessionManager.get_instance().get_session()
     
-    # This URL and the params are based on Sandmann79 analysis
-    base_url = "https://atv-ps.amazon.com/cdp/"
-    params = {
-        "asin": asin,
-        "deviceTypeID": "A1F83G8C2ARO7P", # Example ID, should be configurable
-        "firmware": "1",
-        "format": "json",
-        "marketplaceID": "ATVPDKIKX0DER", # Example ID, should be configurable
-        **kwargs
-    }
+    params = {"asin": asin, **_CDP_DEFAULT_PARAMS, **kwargs}
     
     try:
-        response = session.get(base_url + mode, params=params, timeout=15)
+        response = session.get(_CDP_BASE_URL + mode, params=params, timeout=15)
         response.raise_for_status()
-        return (True, response.json())
-    except requests.exceptions.RequestException as e:
+        return (True, _json_loads(response.content))
+    except (requests.exceptions.RequestException, ValueError) as e:
         _log(xbmc.LOGERROR, f"getURLData failed for {mode} with asin {asin}: {e}")
         return (False, str(e))
\ No newline at end of file
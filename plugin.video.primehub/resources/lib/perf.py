@@ -17,25 +17,24 @@ try:  # pragma: no cover - Kodi runtime
     import xbmc
     import xbmcaddon
 except ImportError:  # pragma: no cover - local dev fallback
-    from ...tests.kodi_mocks import MockXBMC as xbmc
-    from ...tests.kodi_mocks import MockXBMCAddon as xbmcaddon
+    from ...tests.kodi_mocks import xbmc, xbmcaddon
 
 
 LOG_PREFIX = "[PrimeFlix]"
 _PERF_SETTING_ID = "perf_logging"
-_perf_enabled_cache: Optional[bool] = None
 
 
 def _log(level: int, message: str) -> None:
     xbmc.log(f"{LOG_PREFIX} {message}", level)
 
 
+@functools.lru_cache(maxsize=1)
 def is_perf_logging_enabled() -> bool:
-    """Return whether verbose performance logging is enabled by the user."""
+    """Return whether verbose performance logging is enabled by the user.
+
+    Read once per plug-in invocation; ``cache_clear()`` forces a re-read.
+    """
 
-    global _perf_enabled_cache
-    if _perf_enabled_cache is not None:
-        return _perf_enabled_cache
     try:
         addon = xbmcaddon.Addon()
         try:
@@ -44,8 +43,7 @@ def is_perf_logging_enabled() -> bool:
             enabled = str(addon.getSetting(_PERF_SETTING_ID)).lower() == "true"
     except Exception:
         enabled = False
-    _perf_enabled_cache = bool(enabled)
-    return _perf_enabled_cache
+    return bool(enabled)
 
 
 def timed(label: str, warn_threshold_ms: Optional[float] = None) -> Callable:
@@ -8,13 +8,14 @@ try:
 except ImportError:
     from ...tests.kodi_mocks import xbmc, xbmcaddon, xbmcgui
 
-from ..common import Globals
-from ..backend.prime_api import get_prime_video
-from ..backend.session import SessionManager
+from .common import Globals
+from .backend.prime_api import PrimeVideo, get_prime_video
+from .backend.session import SessionManager
 
-def ensure_ready_or_raise() -> None:
+def ensure_ready_or_raise(pv: Optional[PrimeVideo] = None) -> None:
     """
     Ensures the environment is ready, checking for login, inputstream, and DRM.
+    Routes that already hold the backend pass it as *pv* to skip a second lookup.
     """
     session_manager = SessionManager.get_instance()
     if not session_manager.is_logged_in():
@@ -23,7 +24,8 @@ def ensure_ready_or_raise() -> None:
     if not _has_inputstream():
         raise PreflightError("inputstream.adaptive is not available.")
     
-    pv = get_prime_video()
+    if pv is None:
+        pv = get_prime_video()
     if not pv.is_drm_ready():
         raise PreflightError("DRM is not ready.")
 
@@ -2,7 +2,7 @@
 from __future__ import annotations
 import sys
 from dataclasses import dataclass
-from typing import Dict
+from typing import Any, Callable, Dict, Optional
 from urllib.parse import parse_qsl, urlencode
 
 try:
@@ -12,17 +12,35 @@ try:
 except ImportError:
     from ...tests.kodi_mocks import xbmcplugin, xbmcaddon, xbmcgui
 
+from .cache import flush_cache
+from .common import DATACLASS_SLOTS
 from .preflight import PreflightError, show_preflight_error
 from .ui import diagnostics, home, listing, playback, login
 from .backend.prime_api import get_prime_video # Updated import
 
-@dataclass
+@dataclass(**DATACLASS_SLOTS)
 class PluginContext:
     base_url: str
     handle: int
-    def build_url(self, **query: str) -> str:
-        # ... (implementation remains the same)
-        pass
+    def build_url(self, **query: Optional[str]) -> str:
+        """Return a plug-in URL for *query*, dropping ``None`` values."""
+        query = {key: value for key, value in query.items() if value is not None}
+        return f"{self.base_url}?{urlencode(query)}" if query else self.base_url
+
+# action -> handler(context, pv, params). The lambdas resolve the UI modules
+# at call time, so anything patched onto this module is what gets called.
+_ACTIONS: Dict[Optional[str], Callable[[PluginContext, Any, Dict[str, str]], None]] = {
+    None: lambda context, pv, params: home.show_home(context, pv),
+    "list": lambda context, pv, params: listing.show_list(context, pv, params.get("rail_id", "")),
+    "play": lambda context, pv, params: playback.play(context, pv, params.get("asin", "")),
+    "search": lambda context, pv, params: listing.show_search(context, pv, params.get("query")),
+    "diagnostics": lambda context, pv, params: diagnostics.show_results(context, pv),
+    "login": lambda context, pv, params: login.show_login_screen(),
+}
+
+# Listings Kodi must not replay from its directory cache: diagnostics timings
+# are only meaningful when freshly measured.
+_UNCACHED_ACTIONS = frozenset({"diagnostics"})
 
 def dispatch(base_url: str, param_string: str) -> None:
     handle = int(sys.argv[1]) if len(sys.argv) > 1 else 1
@@ -35,19 +53,15 @@ def dispatch(base_url: str, param_string: str) -> None:
     
     try:
         pv = get_prime_video()
-        if not action:
-            home.show_home(context, pv)
-        elif action == "list":
-            listing.show_list(context, pv, params.get("rail_id", ""))
-        elif action == "play":
-            playback.play(context, pv, params.get("asin", ""))
-        # ... other actions like search, diagnostics ...
-        else:
-            home.show_home(context, pv)
-            
+        # Unknown actions fall back to the home screen
+        _ACTIONS.get(action, _ACTIONS[None])(context, pv, params)
     except PreflightError as exc:
         show_preflight_error(exc)
         xbmcplugin.endOfDirectory(handle, succeeded=False)
         return
 
-    xbmcplugin.endOfDirectory(handle)
\ No newline at end of file
+    # Everything else may be served from Kodi's directory cache on back navigation
+    xbmcplugin.endOfDirectory(handle, cacheToDisc=action not in _UNCACHED_ACTIONS)
+    # Kodi may tear the interpreter down before the flush timer or atexit
+    # runs, so write this route's cache entries once the listing is handed off.
+    flush_cache()
@@ -1,6 +1,8 @@
 """Home route building Netflix-style rails for PrimeHub."""
 from __future__ import annotations
-from typing import Any, Dict, List
+import functools
+from itertools import islice
+from typing import Any, Dict, List, Tuple
 try:
     import xbmcaddon
     import xbmcgui
@@ -12,39 +14,106 @@ from ..common import Globals, Settings
 from ..backend.prime_api import PrimeVideo
 from ..perf import timed
 from ..preflight import ensure_ready_or_raise
+from ..cache import cache_key, cache_settings, get_cache
+from .listing import _enc_list, prefetch_rails
+
+# Known rails in display order, with the string used when the backend sends
+# no title. Built once; only untitled rails pay for a localisation lookup.
+_RAIL_TEMPLATE = (
+    ("continue_watching", 40000),
+    ("prime_originals", 40001),
+    ("movies", 40002),
+    ("tv", 40003),
+    ("recommended", 40004),
+)
+_TEMPLATE_IDS = frozenset(rail_id for rail_id, _ in _RAIL_TEMPLATE)
+# Rails at the top of home are the likeliest to be opened next
+_PREFETCH_RAILS = 4
+
+@functools.lru_cache(maxsize=1)
+def fetch_home_rails(pv: PrimeVideo) -> Tuple[Dict[str, Any], ...]:
+    """Return the root rails, fetched once per plug-in invocation.
+
+    Known rails come first in template order, then any others in backend
+    order. Callers that need a fresh fetch (e.g. timing runs) call
+    ``fetch_home_rails.cache_clear()`` first.
+    """
+    rails = _root_rails(pv)
+    by_id = {rail.get("id"): rail for rail in rails}
+    addon = Globals().addon
+    ordered = []
+    for rail_id, string_id in _RAIL_TEMPLATE:
+        rail = by_id.get(rail_id)
+        if rail is None:
+            continue
+        if not rail.get("title"):
+            rail = {**rail, "title": addon.getLocalizedString(string_id)}
+        ordered.append(rail)
+    ordered.extend(rail for rail in rails if rail.get("id") not in _TEMPLATE_IDS)
+    return tuple(ordered)
+
+def _root_rails(pv: PrimeVideo) -> List[Dict[str, Any]]:
+    """The backend's root rails, through the rail cache when it is enabled.
+
+    Every return to home is a new plug-in call, so without the on-disk copy
+    each back navigation re-fetches the storefront.
+    """
+    use_cache, cache_ttl = cache_settings()
+    if not use_cache:
+        return pv.Browse('root')[0]
+    cache = get_cache()
+    key = cache_key("home", "root")
+    rails = cache.get(key, ttl_seconds=cache_ttl)
+    if rails is None:
+        rails, _ = pv.Browse('root')
+        if rails:
+            cache.set(key, rails, cache_ttl)
+    return rails
+
+def _folder_li(label: str, art: Dict[str, str]):
+    li = xbmcgui.ListItem(label=label)
+    li.setArt(art)
+    return li
 
 def show_home(context, pv: PrimeVideo) -> None:
     """Build and display PrimeHub home with Netflix-style rails."""
-    ensure_ready_or_raise()
+    ensure_ready_or_raise(pv)
     g = Globals()
+    fanart = g.DefaultFanart
     
     xbmcplugin.setContent(context.handle, "videos")
     
-    # pv.Browse returns a tuple of (items, next_page_cursor)
-    rails, _ = pv.Browse('root')
+    rails = fetch_home_rails(pv)
     
     list_items = []
+    rest = rails
+    # Every rail URL shares this prefix; only the rail id needs quoting
+    list_base = f"{context.base_url}?"
     
-    # Take the first rail as our "Hero" item
-    if rails:
-        hero_rail = rails.pop(0)
+    # Take the first rail as our "Hero" item, unless the user turned it off.
+    # Read the rails without mutating them; the backend may hand out a shared list
+    if rails and g.addon.getSettingBool("show_hero"):
+        hero_rail = rails[0]
         hero_li = xbmcgui.ListItem(label=f"[B]{hero_rail.get('title', '')}[/B]")
         # For a hero item, we'd want prominent art. We'll use fanart as the poster for now.
-        hero_li.setArt({"icon": g.DefaultFanart, "fanart": g.DefaultFanart, "poster": g.DefaultFanart})
+        hero_li.setArt({"icon": fanart, "fanart": fanart, "poster": fanart})
         hero_li.setProperty("isHero", "true") # For potential skin integration
-        url = context.build_url(action="list", rail_id=hero_rail.get("lazyLoadURL"))
-        # Add it as the first item
-        xbmcplugin.addDirectoryItem(context.handle, url, hero_li, True)
+        url = list_base + _enc_list(hero_rail.get("lazyLoadURL") or "")
+        # First item of the single addDirectoryItems call below
+        list_items.append((url, hero_li, True))
+        rest = islice(rails, 1, None)
 
-    for rail in rails:
-        li = xbmcgui.ListItem(label=rail.get("title", ""))
-        li.setArt({"icon": "DefaultFolder.png", "fanart": g.DefaultFanart})
-        url = context.build_url(action="list", rail_id=rail.get("lazyLoadURL"))
-        list_items.append((url, li, True))
+    # setArt copies the mapping, so every rail can share one art dict
+    folder_art = {"icon": "DefaultFolder.png", "fanart": fanart}
+    list_items += [
+        (list_base + _enc_list(rail.get("lazyLoadURL") or ""), _folder_li(rail.get("title", ""), folder_art), True)
+        for rail in rest
+    ]
 
     # Add static items
-    search_li = xbmcgui.ListItem(label="Search")
-    search_li.setArt({"icon": "DefaultAddonSearch.png", "fanart": g.DefaultFanart})
-    list_items.append((context.build_url(action="search"), search_li, True))
+    search_art = {"icon": "DefaultAddonSearch.png", "fanart": fanart}
+    list_items.append((context.build_url(action="search"), _folder_li("Search", search_art), True))
+
+    xbmcplugin.addDirectoryItems(context.handle, list_items, len(list_items))
 
-    xbmcplugin.addDirectoryItems(context.handle, list_items)
\ No newline at end of file
+    prefetch_rails(context, pv, [rail.get("lazyLoadURL") for rail in islice(rails, _PREFETCH_RAILS)])
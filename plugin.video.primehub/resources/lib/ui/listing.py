@@ -1,67 +1,190 @@
 """Rail listing and search UI handlers."""
 from __future__ import annotations
+import functools
+import threading
 from typing import Any, Dict, List, Optional
+from urllib.parse import quote_from_bytes as _q
 try:
+    import xbmc
     import xbmcgui
     import xbmcplugin
     import xbmcaddon
 except ImportError:
-    from ...tests.kodi_mocks import xbmcgui, xbmcplugin, xbmcaddon
+    from ...tests.kodi_mocks import xbmc, xbmcgui, xbmcplugin, xbmcaddon
 
 from ..backend.prime_api import PrimeVideo
+from ..cache import cache_key, cache_settings, get_cache
+from ..common import Globals, notify
+from ..perf import timed
 from ..preflight import PreflightError
 
+# Timing wraps only the backend fetches below, so cache hits skip the
+# perf_counter and log overhead entirely.
+@timed("search_fetch", warn_threshold_ms=500)
+def _fetch_search(pv: PrimeVideo, query: str) -> Dict[str, Any]:
+    items, next_page = pv.Search(query)
+    return {"items": items, "next": next_page}
+
+@timed("rail_fetch", warn_threshold_ms=500)
+def _fetch_rail(context, pv: PrimeVideo, rail_id: str) -> Dict[str, Any]:
+    items, next_page = pv.Browse(rail_id)
+    return _rail_page(context, items, next_page)
+
+def _search_page(pv: PrimeVideo, query: str) -> Dict[str, Any]:
+    """Return ``{"items", "next"}`` for *query*, from the cache when possible."""
+    use_cache, cache_ttl = cache_settings()
+    if not use_cache:
+        return _fetch_search(pv, query)
+
+    key = cache_key("search", query)
+    cache = get_cache()
+    page = cache.get(key, ttl_seconds=cache_ttl)
+    if page is None:
+        page = _fetch_search(pv, query)
+        if page["items"]:
+            cache.set(key, page, cache_ttl)
+    return page
+
+def _enc_play(asin: str) -> str:
+    """Query string for a play URL; ``action`` is a constant, only the ASIN is quoted."""
+    return f"action=play&asin={_q(asin.encode())}"
+
+def _enc_list(rail_id: str) -> str:
+    """Query string for a rail URL; ``action`` is a constant, only the rail id is quoted."""
+    return f"action=list&rail_id={_q(rail_id.encode())}"
+
+# setArt keys, in the order _render_items supplies their values
+_ART_KEYS = ("poster", "fanart", "icon")
+
+_CONTENT_TYPES = {"movie": "movies", "episode": "tvshows", "tvshow": "tvshows"}
+
+def _content_type(items: List[Dict]) -> str:
+    """Return the Kodi content type for *items*, stopping at the first mixed pair."""
+    first = None
+    for item in items:
+        media_type = item.get("mediatype")
+        if not media_type:
+            continue
+        if first is None:
+            first = media_type
+        elif media_type != first:
+            return "videos"
+    return _CONTENT_TYPES.get(first, "videos")
+
+@functools.lru_cache(maxsize=256)
+def _next_url(base_url: str, next_page: str) -> str:
+    """Plug-in URL for the "Next Page" entry of a rail; pure, so memoized."""
+    return f"{base_url}?{_enc_list(next_page)}"
+
+def _rail_page(context, items: List[Dict], next_page: Optional[str]) -> Dict[str, Any]:
+    """Build the cacheable payload for one rail page.
+
+    The "Next Page" URL is resolved here, once, so cached pages render it
+    without re-encoding the cursor.
+    """
+    return {
+        "items": items,
+        "next": next_page,
+        "next_url": _next_url(context.base_url, next_page) if next_page else None,
+    }
+
+def prefetch_rails(context, pv: PrimeVideo, rail_ids: List[str]) -> Optional[threading.Thread]:
+    """Warm the rail cache for *rail_ids* on a background thread.
+
+    The next plug-in call is a fresh process, so only the on-disk cache can
+    carry a prefetched page over to it. The thread is not a daemon: the
+    interpreter waits for it, and it flushes the cache itself once the pages
+    are in, after Kodi has already drawn the calling directory. Returns the
+    thread, or ``None`` when caching is off or every rail is already fresh.
+    """
+    use_cache, cache_ttl = cache_settings()
+    if not use_cache:
+        return None
+    cache = get_cache()
+    pending = [rail_id for rail_id in rail_ids
+               if rail_id and cache.get(cache_key("rail", rail_id), ttl_seconds=cache_ttl) is None]
+    if not pending:
+        return None
+
+    def warm() -> None:
+        try:
+            pages = pv.BrowseBatch(pending)
+        except Exception:
+            return  # best effort: show_list simply fetches on open
+        for rail_id, (items, next_page) in pages.items():
+            if items:
+                cache.set(cache_key("rail", rail_id), _rail_page(context, items, next_page), cache_ttl)
+        # The route's own flush has already run; don't leave these pages to
+        # the flush timer or atexit, which a torn-down interpreter may skip.
+        cache.flush()
+
+    thread = threading.Thread(target=warm, name="PrimeHub-prefetch")
+    thread.start()
+    return thread
+
 def show_list(context, pv: PrimeVideo, rail_id: str) -> None:
     """Shows the items for a single rail."""
+    use_cache, cache_ttl = cache_settings()
+    cache = get_cache() if use_cache else None
+    key = cache_key("rail", rail_id)
     try:
-        items, next_page = pv.Browse(rail_id)
-        _render_items(context, items, next_page)
+        page = cache.get(key, ttl_seconds=cache_ttl) if cache else None
+        if page is None:
+            page = _fetch_rail(context, pv, rail_id)
+            if cache and page["items"]:
+                cache.set(key, page, cache_ttl)
     except Exception as e:
-        xbmcgui.Dialog().notification("Error", f"Could not load content: {e}")
+        notify(f"Could not load content: {e}")
+        return
+    # Only the fetch is guarded: a rendering bug surfaces as itself, not as
+    # a load failure. An empty page leaves nothing to hand to Kodi.
+    if page["items"]:
+        _render_items(context, page["items"], page.get("next_url"))
 
 def show_search(context, pv: PrimeVideo, query: Optional[str]) -> None:
     """Handles search."""
     if not query:
-        query = xbmcgui.Dialog().input("Search")
+        query = Globals().dialog.input("Search")
     if query:
-        items, _ = pv.Search(query)
-        _render_items(context, items)
+        page = _search_page(pv, query)
+        if page["items"]:
+            _render_items(context, page["items"])
 
-def _render_items(context, items: List[Dict], next_page: Optional[str] = None):
+def _render_items(context, items: List[Dict], next_url: Optional[str] = None):
     """Renders a list of items and sets the view to a poster layout."""
-    try:
-        import xbmc
-    except ImportError:
-        from ...tests.kodi_mocks import xbmc
-
-    # Set the content type to "videos" to enable library-like features
-    xbmcplugin.setContent(context.handle, "videos")
+    # Homogeneous pages get a library content type; anything mixed stays "videos"
+    xbmcplugin.setContent(context.handle, _content_type(items))
 
-    list_items = []
-    for item in items:
-        li = xbmcgui.ListItem(label=item.get("title", ""))
+    # Bind per-page constants once instead of re-resolving them for every item
+    list_item = xbmcgui.ListItem
+    play_base = f"{context.base_url}?"
+    # Pure-Python pass first: every URL is built before any Kodi object is made
+    urls = [play_base + _enc_play(item.get("asin") or "") for item in items]
+    list_items = [None] * (len(items) + (1 if next_url else 0))
+    for index, item in enumerate(items):
+        # Each field is looked up once, however many places use it
+        title = item.get("title", "")
+        li = list_item(label=title)
         # Set the plot and other metadata
         li.setInfo("video", {
-            "title": item.get("title", ""),
+            "title": title,
             "plot": item.get("plot", ""),
-            "mediatype": "video" # Generic video type
-        })
-        # Set the artwork
-        art = item.get("art", {})
-        li.setArt({
-            "poster": art.get("poster"),
-            "fanart": art.get("fanart"),
-            "icon": art.get("poster") # Use poster for icon as well
+            "mediatype": item.get("mediatype") or "video"
         })
+        # Set the artwork, skipping the call when the item has none
+        art = item.get("art")
+        if art:
+            poster = art.get("poster")
+            fanart = art.get("fanart")
+            if poster or fanart:
+                # Use poster for icon as well; only non-empty URLs are passed
+                li.setArt({key: url for key, url in zip(_ART_KEYS, (poster, fanart, poster)) if url})
         # Mark the item as playable
         li.setProperty("IsPlayable", "true")
-        url = context.build_url(action="play", asin=item.get("asin"))
-        list_items.append((url, li, False))
+        list_items[index] = (urls[index], li, False)
 
-    if next_page:
-        next_li = xbmcgui.ListItem(label="Next Page...")
-        next_url = context.build_url(action="list", rail_id=next_page)
-        list_items.append((next_url, next_li, True))
+    if next_url:
+        list_items[-1] = (next_url, list_item(label="Next Page..."), True)
 
     xbmcplugin.addDirectoryItems(context.handle, list_items, len(list_items))
     
@@ -1,6 +1,7 @@
 """Playback route handing off manifests to Kodi."""
 from __future__ import annotations
-from typing import Any, Dict
+from typing import Any, Dict, Tuple
+from urllib.parse import quote, urlencode
 
 try:
     import xbmcgui
@@ -9,36 +10,89 @@ except ImportError:
     from ...tests.kodi_mocks import xbmcgui, xbmcplugin
 
 from ..backend.prime_api import PrimeVideo, Playable
+from ..cache import cache_key, cache_settings, get_cache
+from ..common import notify
 from ..preflight import PreflightError
 
+# Playback resources carry short-lived tokens; reuse them only briefly
+_STREAM_TTL = 60
+
 def play(context, pv: PrimeVideo, asin: str) -> None:
     """Gets playback resources and hands them off to Kodi."""
     try:
-        success, stream_info = pv.GetStream(asin)
+        success, stream_info = _get_stream(pv, asin)
         if not success:
             raise PreflightError(stream_info)
-        
-        playable = Playable(
-            url=stream_info.get("manifestUrl"),
-            manifest_type="mpd",
-            license_key=stream_info.get("licenseUrl"),
-            headers={},
-            metadata={"title": f"Playable for {asin}"}
-        )
-        
+
+        playable = _normalize_playback(asin, stream_info)
         list_item = _build_list_item(playable)
         xbmcplugin.setResolvedUrl(context.handle, True, list_item)
         
     except Exception as e:
-        xbmcgui.Dialog().notification("Error", f"Could not get playback stream: {e}")
+        _forget_stream(asin)
+        notify(f"Could not get playback stream: {e}")
+
+def _get_stream(pv: PrimeVideo, asin: str) -> Tuple[bool, Dict[str, Any] | str]:
+    """``pv.GetStream(asin)``, reusing a result from the last ``_STREAM_TTL`` seconds.
+
+    A retry or resume is a new plug-in process, so only the on-disk cache
+    can spare it the playback-resources round trip.
+    """
+    use_cache, _ = cache_settings()
+    if not use_cache:
+        return pv.GetStream(asin)
+    cache = get_cache()
+    key = cache_key("stream", asin)
+    stream_info = cache.get(key)
+    if stream_info is not None:
+        return True, stream_info
+    success, stream_info = pv.GetStream(asin)
+    if success:
+        cache.set(key, stream_info, _STREAM_TTL)
+    return success, stream_info
+
+def _forget_stream(asin: str) -> None:
+    """Drop the cached stream for *asin*, so a retry fetches fresh URLs."""
+    use_cache, _ = cache_settings()
+    if use_cache:
+        get_cache().delete(cache_key("stream", asin))
+
+def _normalize_playback(asin: str, stream_info: Dict[str, Any]) -> Playable:
+    """Map ``PrimeVideo.GetStream`` output onto a :class:`Playable` in one pass."""
+    return Playable(
+        url=stream_info["manifest_url"],
+        license_key=stream_info.get("license_url"),
+        headers=stream_info.get("headers") or {},
+        metadata={"title": stream_info.get("title") or f"Playable for {asin}"},
+    )
+
+def _headers_to_prop(headers: Dict[str, str]) -> str:
+    """Serialize *headers* for ``inputstream.adaptive.stream_headers``.
+
+    Values are percent-encoded so auth tokens with reserved or non-ASCII
+    characters survive the ``k=v&k=v`` format.
+    """
+    return urlencode(headers, quote_via=quote)
 
 def _build_list_item(playable: Playable) -> xbmcgui.ListItem:
     li = xbmcgui.ListItem(label=playable.metadata.get("title", "Prime Video"))
-    li.setProperty("inputstream", "inputstream.adaptive")
-    li.setProperty("inputstream.adaptive.manifest_type", playable.manifest_type)
+    props = {
+        "inputstream": "inputstream.adaptive",
+        "inputstream.adaptive.manifest_type": playable.manifest_type,
+    }
     if playable.license_key:
-        li.setProperty("inputstream.adaptive.license_type", "com.widevine.alpha")
-        li.setProperty("inputstream.adaptive.license_key", playable.license_key)
-    li.setMimeType("application/dash+xml")
+        props["inputstream.adaptive.license_type"] = playable.license_type
+        props["inputstream.adaptive.license_key"] = playable.license_key
+    if playable.headers:
+        props["inputstream.adaptive.stream_headers"] = _headers_to_prop(playable.headers)
+    # Kodi 20+ takes the whole bag in one call; Kodi 19 needs one per property
+    set_properties = getattr(li, "setProperties", None)
+    if set_properties is not None:
+        set_properties(props)
+    else:
+        set_property = li.setProperty
+        for key, value in props.items():
+            set_property(key, value)
+    li.setMimeType(playable.mime_type)
     li.setContentLookup(False)
     return li
\ No newline at end of file
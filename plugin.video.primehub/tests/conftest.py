@@ -0,0 +1,69 @@
+"""Shared pytest setup for the PrimeHub test suite.
+
+Kodi modules are replaced with the ``kodi_mocks`` singletons once per
+session, before any test module imports add-on code, and the add-on root is put on
+``sys.path`` so tests import add-on code as ``resources.lib.*``. The autouse
+``_fresh_kodi_mocks`` fixture then clears the shared mocks before each test.
+
+This happens in ``pytest_configure`` rather than in a session fixture because
+test modules import add-on code during collection, before any fixture runs.
+
+UI test modules name their module under test in ``UI_MODULE`` and opt into
+``ui_cache`` to get ``get_cache`` patched once per file. The UI handlers take
+the ``PrimeVideo`` backend as an argument, so tests pass a ``Mock`` directly.
+"""
+import importlib
+import os
+import sys
+from unittest.mock import Mock, patch
+
+import pytest
+
+from .kodi_mocks import patch_kodi_modules_globally, reset_kodi_mocks
+
+ADDON_PATH = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+
+# Add-on modules imported once, up front, so every test module reuses the
+# same sys.modules entry.
+_PRELOAD = (
+    "resources.lib.cache",
+    "resources.lib.perf",
+    "resources.lib.ui.home",
+    "resources.lib.ui.listing",
+    "resources.lib.ui.login",
+    "resources.lib.ui.playback",
+    "resources.lib.ui.diagnostics",
+)
+
+
+def pytest_configure(config):
+    """Install the Kodi mocks once per session, ahead of collection."""
+    patch_kodi_modules_globally()
+    if ADDON_PATH not in sys.path:
+        sys.path.insert(0, ADDON_PATH)
+    for name in _PRELOAD:
+        importlib.import_module(name)
+
+
+@pytest.fixture(autouse=True)
+def _fresh_kodi_mocks():
+    """Clear calls and configured results on the shared Kodi mocks."""
+    reset_kodi_mocks()
+
+
+@pytest.fixture(scope="module")
+def mock_get_cache(request):
+    """``get_cache`` in the test file's ``UI_MODULE``, patched once per file."""
+    with patch(f"{request.module.UI_MODULE}.get_cache", new_callable=Mock) as factory:
+        factory.return_value = Mock()
+        yield factory
+
+
+@pytest.fixture
+def ui_cache(request, mock_get_cache):
+    """Reset the module-scoped ``get_cache`` patch and expose it on the TestCase."""
+    mock_get_cache.reset_mock()
+    mock_get_cache.return_value.reset_mock(return_value=True, side_effect=True)
+    cls = request.cls
+    cls.mock_get_cache = mock_get_cache
+    cls.mock_cache_instance = mock_get_cache.return_value
@@ -1,6 +1,5 @@
 # Mock objects for running outside of Kodi
-from unittest.mock import MagicMock
-import os
+from unittest.mock import MagicMock, Mock
 import sys
 
 # --- Mock Classes for Kodi Components ---
@@ -15,74 +14,183 @@ class MockXBMC:
     def log(self, message: str, level: int = 0) -> None:
         pass # Suppress logging during tests
 
+    def getCondVisibility(self, condition: str) -> bool:
+        return False
+
     def executeJSONRPC(self, payload: str) -> str:
         return '{"result": {}}' # Default empty result for JSONRPC
 
+    def executebuiltin(self, function: str, wait: bool = False) -> None:
+        pass
+
 # xbmcaddon module mocks
+class _Table(dict):
+    """Lookup table whose ``__getitem__`` falls back to a default.
+
+    Its bound ``__getitem__`` is used directly as a ``side_effect``: hits are a
+    plain C-level dict lookup, no lambda frame in between.
+    """
+    def __init__(self, default, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.default = default
+
+    def __missing__(self, key):
+        return self.default
+
+# Lookup tables are built once at import; the side_effects below only index them.
+_ADDON_INFO = _Table("", {
+    "id": "plugin.video.primeflix",
+    "profile": "/mock/path/to/profile",
+    "path": "/mock/path/to/addon",
+    "fanart": "/mock/path/to/fanart.jpg",
+    "name": "PrimeHub"
+})
+_SETTINGS = _Table("0", {
+    "region": "0", # us
+    "max_resolution": "0", # auto
+    "use_cache": "true",
+    "cache_ttl": "300",
+    "perf_logging": "false",
+    "show_hero": "true",
+})
+_SETTINGS_BOOL = _Table(False, {
+    "use_cache": True,
+    "perf_logging": False,
+    "show_hero": True,
+})
+_SETTINGS_INT = _Table(0, {
+    "cache_ttl": 300,
+})
+
+def _build_addon(addon_id=None):
+    mock_addon = Mock()
+    addon_info = _ADDON_INFO if addon_id is None else _Table("", _ADDON_INFO, id=addon_id)
+    mock_addon.getAddonInfo.side_effect = addon_info.__getitem__
+    mock_addon.getSetting.side_effect = _SETTINGS.__getitem__
+    mock_addon.getSettingBool.side_effect = _SETTINGS_BOOL.__getitem__
+    mock_addon.getSettingInt.side_effect = _SETTINGS_INT.__getitem__
+    mock_addon.getLocalizedString.side_effect = "LocalizedString_{}".format
+    return mock_addon
+
+# One mock per add-on id: production code calls Addon() freely, and building
+# a configured Mock each time is the expensive part. The add-on's own
+# instance, the only one it asks for, is built once at import.
+_ADDON = _build_addon()
+_ADDONS = {None: _ADDON}
+
 class MockXBMCAddon:
     def Addon(self, addon_id=None):
-        mock_addon = MagicMock()
-        mock_addon.getAddonInfo.side_effect = lambda key: {
-            "id": addon_id or "plugin.video.primeflix",
-            "profile": "/mock/path/to/profile",
-            "path": "/mock/path/to/addon",
-            "fanart": "/mock/path/to/fanart.jpg",
-            "name": "PrimeHub"
-        }.get(key, "")
-        mock_addon.getSetting.side_effect = lambda key: {
-            "region": "0", # us
-            "max_resolution": "0", # auto
-            "use_cache": "true",
-            "cache_ttl": "300",
-            "perf_logging": "false",
-        }.get(key, "0")
-        mock_addon.getSettingBool.side_effect = lambda key: {
-            "use_cache": True,
-            "perf_logging": False,
-        }.get(key, False)
-        mock_addon.getSettingInt.side_effect = lambda key: {
-            "cache_ttl": 300,
-        }.get(key, 0)
-        mock_addon.getLocalizedString.side_effect = (
-            lambda code: f"LocalizedString_{code}"
-        )
+        if addon_id is None:
+            return _ADDON
+        mock_addon = _ADDONS.get(addon_id)
+        if mock_addon is None:
+            mock_addon = _ADDONS[addon_id] = _build_addon(addon_id)
         return mock_addon
 
 # xbmcgui module mocks
+class _DialogFactory:
+    """Stands in for ``xbmcgui.Dialog``; every call returns one shared ``Mock``.
+
+    Only the dialog instance needs call recording, so the class itself stays a
+    plain callable. ``return_value`` mirrors the mock attribute tests use.
+    """
+    _instance = Mock()
+
+    def __init__(self):
+        self.return_value = self._instance
+
+    def __call__(self):
+        return self.return_value
+
+    def reset(self):
+        self.return_value = self._instance
+        self._instance.reset_mock(return_value=True, side_effect=True)
+
 class MockXBMCGUI:
     INPUT_PASSWORD = 1
     NOTIFICATION_INFO = 1
     NOTIFICATION_WARNING = 2
     NOTIFICATION_ERROR = 3
 
-    Dialog = MagicMock() # Mock the Dialog class itself
-    ListItem = MagicMock() # Mock the ListItem class itself
+    Dialog = _DialogFactory()
+    ListItem = Mock() # Mock the ListItem class itself
 
 # xbmcplugin module mocks
 class MockXBMCPlugin:
     SORT_METHOD_UNSORTED = 0
-    def addDirectoryItems(self, handle, items): pass
-    def endOfDirectory(self, handle, succeeded=True): pass
+    def addDirectoryItems(self, handle, items, totalItems=0): pass
+    def endOfDirectory(self, handle, succeeded=True, updateListing=False, cacheToDisc=True): pass
     def setContent(self, handle, content): pass
     def setResolvedUrl(self, handle, succeeded, listitem): pass
 
 # xbmcvfs module mocks
+# One file object serves every File() call: an empty, reusable context manager.
+_FILE = MagicMock()
+_FILE.read.return_value = ''
+_FILE.__enter__.return_value = _FILE
+
 class MockXBMCRuntime:
     def exists(self, path): return False
     def mkdirs(self, path): pass
     def translatePath(self, path): return path
     def delete(self, path): pass
     def File(self, path, mode='r'):
-        mock_file = MagicMock()
-        mock_file.read.return_value = ''
-        mock_file.__enter__.return_value = mock_file
-        return mock_file
+        return _FILE
+
+# --- Module singletons ---
+# Built once at import. Tests re-install these same objects, so add-on modules
+# that bound a Kodi module at import time keep seeing the mocks the test sees.
+# The names also serve the add-on's ``from ...tests.kodi_mocks import xbmc``
+# fallbacks.
+xbmc = MockXBMC()
+xbmcaddon = MockXBMCAddon()
+xbmcgui = MockXBMCGUI()
+xbmcplugin = MockXBMCPlugin()
+xbmcvfs = MockXBMCRuntime()
+translatePath = xbmcvfs.translatePath
+
+_KODI_MODULES = {
+    "xbmc": xbmc,
+    "xbmcaddon": xbmcaddon,
+    "xbmcgui": xbmcgui,
+    "xbmcplugin": xbmcplugin,
+    "xbmcvfs": xbmcvfs,
+}
+
+def swap_attr(testcase, obj, name, new):
+    """Set ``obj.name = new`` for one test and restore it on cleanup.
+
+    For attributes on the plain mock modules above this is all ``patch.object``
+    does, without the patcher bookkeeping.
+    """
+    old = getattr(obj, name)
+    setattr(obj, name, new)
+    testcase.addCleanup(setattr, obj, name, old)
+    return new
+
+def capture_directory_items(testcase):
+    """Record ``xbmcplugin.addDirectoryItems`` calls for one test.
+
+    Returns the list that each ``(handle, items)`` call is appended to; a plain
+    list append is far cheaper than mock call recording.
+    """
+    captured = []
+    swap_attr(testcase, xbmcplugin, "addDirectoryItems",
+              lambda handle, items, totalItems=0: captured.append((handle, items)))
+    return captured
 
 # --- Centralized Patching of sys.modules for Kodi components ---
 # This ensures that when any module imports xbmc, xbmcaddon, etc., they get our mocks.
 def patch_kodi_modules_globally():
-    sys.modules["xbmc"] = MockXBMC()
-    sys.modules["xbmcaddon"] = MockXBMCAddon()
-    sys.modules["xbmcgui"] = MockXBMCGUI()
-    sys.modules["xbmcplugin"] = MockXBMCPlugin()
-    sys.modules["xbmcvfs"] = MockXBMCRuntime()
\ No newline at end of file
+    # setdefault: a second call leaves the installed singletons untouched
+    for name, module in _KODI_MODULES.items():
+        sys.modules.setdefault(name, module)
+    reset_kodi_mocks()
+
+def reset_kodi_mocks():
+    """Clear calls and configured results on the shared mocks between tests."""
+    MockXBMCGUI.Dialog.reset()
+    MockXBMCGUI.ListItem.reset_mock(return_value=True, side_effect=True)
+    for mock_addon in _ADDONS.values():
+        mock_addon.reset_mock()
+    _FILE.reset_mock()  # keeps the configured read() and __enter__
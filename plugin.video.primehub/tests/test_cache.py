@@ -1,55 +1,179 @@
+import threading
 import unittest
-from unittest.mock import MagicMock, patch
+from unittest.mock import MagicMock, Mock, patch
 import sys
 import os
 import json
-import time
+from types import SimpleNamespace
 
-# Import and apply global patches for Kodi modules
-from .kodi_mocks import patch_kodi_modules_globally
-
-# Add the lib directory to sys.path
-sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../resources/lib')))
+# Kodi modules and the add-on root on sys.path are set up once by conftest.py
+from .kodi_mocks import swap_attr
 
 # Import the module under test
-import cache as cache_module
+import resources.lib.cache as cache_module
+
+# Wire-format cache entries, serialized once; time.time() is fixed at 1000.
+STALE_ENTRY_JSON = '{"timestamp": 100, "ttl": 60, "key": "rail:home", "data": ["a"]}'
 
 
 class TestCache(unittest.TestCase):
 
+    @classmethod
+    def setUpClass(cls):
+        # xbmcvfs doubles are built once; setUp resets and swaps them in
+        # File() is used as a context manager, so only it needs MagicMock
+        cls._vfs_mocks = {'File': MagicMock(), 'delete': Mock(), 'exists': Mock()}
+
     def setUp(self):
-        patch_kodi_modules_globally()
+        for mock in self._vfs_mocks.values():
+            mock.reset_mock(return_value=True, side_effect=True)
         self.mock_xbmcvfs = sys.modules['xbmcvfs']
         
         # Reset get_cache to ensure a fresh instance
         cache_module._cache_instance = None
         self.cache_instance = cache_module.get_cache()
         self.cache_instance._base_path = "/mock/cache" # Override base path
-        self.cache_instance._lock = MagicMock() # Mock lock
+
+        patcher = patch('os.replace', new_callable=Mock)
+        self.mock_replace = patcher.start()
+        self.addCleanup(patcher.stop)
+        # One fixed clock for every test instead of a decorator per test
+        patcher = patch('time.time', new_callable=Mock, return_value=1000)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        # xbmcvfs is a plain mock module: swap its functions directly
+        self.mock_file_class = swap_attr(self, self.mock_xbmcvfs, 'File', self._vfs_mocks['File'])
+        self.mock_delete = swap_attr(self, self.mock_xbmcvfs, 'delete', self._vfs_mocks['delete'])
+        self.mock_exists = swap_attr(self, self.mock_xbmcvfs, 'exists', self._vfs_mocks['exists'])
 
         # Ensure directory exists for tests
-        self.mock_xbmcvfs.exists.side_effect = lambda path: path == self.cache_instance._base_path
+        self.mock_exists.side_effect = {self.cache_instance._base_path}.__contains__
         
-    def tearDown(self):
-        patch.stopall()
-
-    # ... (rest of the tests remain the same, they should work with the new mock setup)
-    @patch('time.time', return_value=1000)
-    def test_set_and_get_success(self, mock_time):
-        mock_file_content = ""
+    def test_set_and_get_success(self):
+        written = []
         mock_file_obj = MagicMock()
         mock_file_obj.__enter__.return_value = mock_file_obj
-        mock_file_obj.write.side_effect = lambda data: globals().update(mock_file_content=data)
+        mock_file_obj.write.side_effect = written.append
         
-        with patch('xbmcvfs.File', return_value=mock_file_obj):
-            self.mock_xbmcvfs.exists.side_effect = lambda path: path == self.cache_instance._filepath("test_key")
-            
-            self.cache_instance.set("test_key", {"data": "value"}, 60)
-            
-            # Now, simulate the read
-            mock_file_obj.read.return_value = mock_file_content
-            retrieved_data = self.cache_instance.get("test_key")
-            self.assertEqual(retrieved_data, {"data": "value"})
-
-if __name__ == '__main__':
-    unittest.main()
\ No newline at end of file
+        self.mock_file_class.return_value = mock_file_obj
+        self.mock_exists.side_effect = {self.cache_instance._filepath("test_key")}.__contains__
+
+        self.cache_instance.set("test_key", {"data": "value"}, 60)
+        self.cache_instance.flush()
+        self.mock_file_class.assert_called_once_with(self.cache_instance._filepath("test_key") + ".tmp", "w")
+        self.mock_replace.assert_called_once_with(
+            self.cache_instance._filepath("test_key") + ".tmp", self.cache_instance._filepath("test_key")
+        )
+
+        # Now, simulate the read
+        self.cache_instance._mem.clear()
+        mock_file_obj.read.return_value = written[0]
+        retrieved_data = self.cache_instance.get("test_key")
+        self.assertEqual(retrieved_data, {"data": "value"})
+
+    def test_batched_flush(self):
+        mock_file_obj = MagicMock()
+        mock_file_obj.__enter__.return_value = mock_file_obj
+
+        self.mock_file_class.return_value = mock_file_obj
+        for i in range(5):
+            self.cache_instance.set("rail:home", {"page": i}, 60)
+
+        # Pending writes are served from memory without touching disk.
+        self.assertEqual(self.cache_instance.get("rail:home"), {"page": 4})
+        self.mock_file_class.assert_not_called()
+
+        self.cache_instance.flush()
+        self.mock_file_class.assert_called_once_with(self.cache_instance._filepath("rail:home") + ".tmp", "w")
+        self.assertEqual(json.loads(mock_file_obj.write.call_args[0][0])["data"], {"page": 4})
+
+    def _scandir(self, paths):
+        entries = [SimpleNamespace(path=p, name=os.path.basename(p)) for p in paths]
+        scandir = MagicMock()
+        scandir.return_value.__enter__.return_value = iter(entries)
+        return scandir
+
+    def test_clear_prefix(self):
+        paths = [self.cache_instance._filepath(k) for k in ("rail:home", "rail:movies", "search:home")]
+        with patch('os.scandir', self._scandir(paths)):
+            self.cache_instance.clear_prefix("rail:")
+
+        self.mock_file_class.assert_not_called()
+        self.assertEqual(
+            sorted(call[0][0] for call in self.mock_delete.call_args_list),
+            sorted([self.cache_instance._filepath("rail:home"), self.cache_instance._filepath("rail:movies")]),
+        )
+
+    def test_clear_prefix_missing_dir(self):
+        with patch('os.scandir', Mock(side_effect=FileNotFoundError)):
+            self.cache_instance.clear_prefix("rail:")
+        self.mock_delete.assert_not_called()
+
+    def test_repeat_get_served_from_memory(self):
+        self.cache_instance.set("rail:home", ["a"], 60)
+        self.cache_instance.flush()
+        self.mock_file_class.reset_mock()
+
+        self.assertEqual(self.cache_instance.get("rail:home"), ["a"])
+        self.assertEqual(self.cache_instance.get("rail:home"), ["a"])
+        self.mock_file_class.assert_not_called()
+
+    def test_clear_all(self):
+        live = self.cache_instance._filepath("rail:home")
+        paths = [live, live + ".tmp", "/mock/cache/settings.xml"]
+        self.mock_exists.reset_mock()
+        with patch('os.scandir', self._scandir(paths)):
+            self.cache_instance.clear_all()
+
+        self.assertEqual([call[0][0] for call in self.mock_delete.call_args_list], [live, live + ".tmp"])
+        self.assertEqual(self.mock_exists.call_count, 0)
+
+    def test_stale_entry_on_disk_is_deleted(self):
+        path = self.cache_instance._filepath("rail:home")
+        self.mock_exists.side_effect = {path}.__contains__
+        self.mock_file_class.return_value.__enter__.return_value.read.return_value = STALE_ENTRY_JSON
+
+        self.assertIsNone(self.cache_instance.get("rail:home"))
+        self.mock_delete.assert_called_once_with(path)
+
+    def test_atomic_rename(self):
+        path = self.cache_instance._filepath("rail:home")
+        self.mock_replace.side_effect = OSError("crash before rename")
+        self.cache_instance.set("rail:home", ["a"], 60)
+        self.cache_instance.flush()
+        self.mock_delete.assert_called_once_with(path + ".tmp")
+
+        self.cache_instance._mem.clear()
+        self.mock_delete.reset_mock()
+        self.assertIsNone(self.cache_instance.get("rail:home"))
+        self.mock_delete.assert_not_called()
+
+    def test_concurrent_get_and_set_share_the_lru(self):
+        # A small LRU makes every set() evict while other threads reorder it.
+        swap_attr(self, cache_module, '_MEM_MAX', 8)
+        # Switch threads often enough for an unguarded LRU to trip over itself.
+        self.addCleanup(sys.setswitchinterval, sys.getswitchinterval())
+        sys.setswitchinterval(1e-6)
+        errors = []
+        start = threading.Barrier(4)
+
+        def worker(n):
+            start.wait()
+            try:
+                for i in range(2000):
+                    key = f"k{n}:{i % 24}"
+                    self.cache_instance.set(key, i, 60)
+                    self.cache_instance.get(f"k{(n + 1) % 4}:{(i - 2) % 24}")
+            except Exception as exc:  # pragma: no cover - reported below
+                errors.append(exc)
+
+        threads = [threading.Thread(target=worker, args=(n,)) for n in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.cache_instance.flush()
+
+        self.assertEqual(errors, [])
+        self.assertLessEqual(len(self.cache_instance._mem), 8)
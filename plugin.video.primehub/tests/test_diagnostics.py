@@ -0,0 +1,53 @@
+import unittest
+from unittest.mock import DEFAULT, Mock, patch
+import sys
+from types import SimpleNamespace
+
+# Kodi modules and the add-on root on sys.path are set up once by conftest.py
+from .kodi_mocks import capture_directory_items
+
+# Import the module under test
+import resources.lib.ui.diagnostics as diagnostics_module
+
+# Shared, never-mutated fixtures
+HOME_RAILS = ({"id": "movies"}, {"id": "tv"})
+
+
+class TestUIDiagnostics(unittest.TestCase):
+
+    def setUp(self):
+        # One patcher for both module-level helpers
+        patcher = patch.multiple('resources.lib.ui.diagnostics', new_callable=Mock,
+                                 fetch_home_rails=DEFAULT, ensure_ready_or_raise=DEFAULT, get_cache=DEFAULT)
+        mocks = patcher.start()
+        self.addCleanup(patcher.stop)
+        self.mock_fetch_home_rails = mocks['fetch_home_rails']
+        self.mock_fetch_home_rails.return_value = HOME_RAILS
+        self.mock_ensure_ready_or_raise = mocks['ensure_ready_or_raise']
+        self.mock_cache = mocks['get_cache'].return_value
+
+        self.directory_items = capture_directory_items(self)
+
+        # The shared ListItem mock, reset before each test by conftest
+        self.mock_list_item = sys.modules['xbmcgui'].ListItem
+
+        self.mock_context = SimpleNamespace(handle=1, base_url="plugin://plugin.video.primeflix/")
+
+    def test_show_results_success(self):
+        pv = SimpleNamespace(clear_responses=Mock())
+        diagnostics_module.show_results(self.mock_context, pv)
+
+        self.mock_ensure_ready_or_raise.assert_called_once_with(pv)
+        self.assertEqual(self.mock_fetch_home_rails.call_count, 3)
+        # Every run skips the lru memo; only the cold run clears the caches behind it.
+        self.assertEqual(self.mock_fetch_home_rails.cache_clear.call_count, 3)
+        pv.clear_responses.assert_called_once_with()
+        self.mock_cache.clear_prefix.assert_called_once_with("home:")
+        self.assertEqual(self.mock_list_item.return_value.setInfo.call_count, 3)
+        self.assertEqual(len(self.directory_items), 1)
+        self.assertEqual(len(self.directory_items[0][1]), 3)
+        # Clicking a result must not re-run the diagnostics
+        self.assertEqual({(url, is_folder) for url, _, is_folder in self.directory_items[0][1]}, {("", False)})
+        self.assertEqual([label.split(":")[0] for label in
+                          (call.kwargs["label"] for call in self.mock_list_item.call_args_list)],
+                         ["Run 1", "Run 2", "Run 3"])
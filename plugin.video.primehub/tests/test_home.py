@@ -1,73 +1,128 @@
 import unittest
-from unittest.mock import MagicMock, patch
+from unittest.mock import Mock, patch
 import sys
-import os
+from types import SimpleNamespace
 
-# Import and apply global patches for Kodi modules
-from .kodi_mocks import patch_kodi_modules_globally
+import pytest
 
-# Add the lib directory to sys.path
-sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../resources/lib')))
+# Kodi modules and the add-on root on sys.path are set up once by conftest.py
+from .kodi_mocks import swap_attr
 
 # Import the module under test
-import ui.home as home_module
-from backend.prime_api import BackendError, AuthenticationError
-from preflight import PreflightError
+import resources.lib.ui.home as home_module
+import resources.lib.cache as cache_module
+from resources.lib.common import Globals
 
 
+# Shared, never-mutated fixtures
+SINGLE_RAIL_ROOT = ([{"title": "Rail"}], None)
+MIXED_RAILS_ROOT = ([
+    {"id": "extra", "title": "Extra"},
+    {"id": "movies", "title": ""},
+    {"id": "continue_watching", "title": "Keep Watching"},
+], None)
+
+# get_cache is patched once per file by conftest's ui_cache
+UI_MODULE = "resources.lib.ui.home"
+
+
+@pytest.fixture(autouse=True)
+def _fresh_memos():
+    """Clear the per-invocation memos, so no test sees another's settings or rails."""
+    memos = (cache_module.cache_settings, cache_module._region, home_module.fetch_home_rails)
+    for memo in memos:
+        memo.cache_clear()
+    yield
+    for memo in memos:
+        memo.cache_clear()
+
+
+@pytest.mark.usefixtures("ui_cache")
 class TestUIHome(unittest.TestCase):
 
+    @classmethod
+    def setUpClass(cls):
+        # Mock construction is the costly part: build the doubles once and
+        # only reset them per test. No magic methods are used, so plain Mock.
+        cls._class_mocks = (
+            Mock(),  # xbmcplugin
+            Mock(),  # Globals().addon
+            Mock(),  # xbmcgui.ListItem
+            Mock(),  # PrimeVideo
+        )
+
     def setUp(self):
-        patch_kodi_modules_globally()
-        
-        # Patch external dependencies
-        self.patcher_get_backend = patch('ui.home.get_backend')
-        self.mock_get_backend = self.patcher_get_backend.start()
-        self.mock_backend_instance = MagicMock()
-        self.mock_get_backend.return_value = self.mock_backend_instance
-
-        self.patcher_get_cache = patch('ui.home.get_cache')
-        self.mock_get_cache = self.patcher_get_cache.start()
-        self.mock_cache_instance = MagicMock()
-        self.mock_get_cache.return_value = self.mock_cache_instance
-        
-        self.patcher_ensure_ready_or_raise = patch('ui.home.ensure_ready_or_raise')
-        self.mock_ensure_ready_or_raise = self.patcher_ensure_ready_or_raise.start()
+        for mock in self._class_mocks:
+            mock.reset_mock(return_value=True, side_effect=True)
+        xbmcplugin, addon, list_item, self.mock_pv = self._class_mocks
+
+        patcher = patch('resources.lib.ui.home.ensure_ready_or_raise', new_callable=Mock)
+        self.mock_ensure_ready_or_raise = patcher.start()
+        self.addCleanup(patcher.stop)
         
-        self.patcher_xbmcplugin = patch('xbmcplugin')
-        self.mock_xbmcplugin = self.patcher_xbmcplugin.start()
-
-        # Mock xbmcaddon.Addon() for local settings
-        self.patcher_xbmcaddon = patch('xbmcaddon.Addon')
-        self.mock_xbmcaddon = self.patcher_xbmcaddon.start()
-        self.mock_addon_instance = MagicMock()
-        self.mock_xbmcaddon.return_value = self.mock_addon_instance
+        # Kodi modules are plain mock objects: swap attributes directly
+        self.mock_xbmcplugin = swap_attr(self, home_module, 'xbmcplugin', xbmcplugin)
+
+        # home and listing read settings and strings through Globals().addon
+        self.mock_addon = swap_attr(self, Globals(), 'addon', addon)
+        addon.getSettingBool.side_effect = {"use_cache": True, "show_hero": True}.__getitem__
+        addon.getSettingInt.return_value = 300
+        addon.getSetting.return_value = "0"  # region
+        addon.getLocalizedString.side_effect = "LocalizedString_{}".format
         
         # Mock ListItem for assertions
-        self.patcher_xbmcgui = patch('xbmcgui.ListItem')
-        self.mock_list_item = self.patcher_xbmcgui.start()
+        self.mock_list_item = swap_attr(self, sys.modules['xbmcgui'], 'ListItem', list_item)
+
+        # Miss the rail cache so fetch_home_rails goes to the backend
+        self.mock_cache_instance.get.return_value = None
 
         # Create a mock context
-        self.mock_context = MagicMock()
-        self.mock_context.handle = 1
-        self.mock_context.build_url.side_effect = lambda **kwargs: "plugin_url?" + "&".join(f"{k}={v}" for k,v in kwargs.items())
+        self.mock_context = SimpleNamespace(
+            handle=1,
+            base_url="plugin://plugin.video.primeflix/",
+            build_url=Mock(return_value="plugin_url"),
+        )
+
+    def test_fetch_home_rails_memoized(self):
+        pv = self.mock_pv
+        pv.Browse.return_value = SINGLE_RAIL_ROOT
 
-    def tearDown(self):
-        patch.stopall()
+        first = home_module.fetch_home_rails(pv)
+        second = home_module.fetch_home_rails(pv)
+
+        self.assertEqual(first, ({"title": "Rail"},))
+        self.assertIs(first, second)
+        pv.Browse.assert_called_once_with('root')
 
-    # ... (rest of the tests remain the same, they should work with the new mock setup)
     def test_fetch_home_rails_cache_hit(self):
-        cached_rails = [{"id": "cached", "title": "Cached Rail"}]
-        self.mock_cache_instance.get.return_value = cached_rails
+        # A fresh process finds the root rails in the home:<region>:root entry
+        self.mock_cache_instance.get.return_value = SINGLE_RAIL_ROOT[0]
+
+        rails = home_module.fetch_home_rails(self.mock_pv)
+
+        self.assertEqual(rails, ({"title": "Rail"},))
+        self.mock_cache_instance.get.assert_called_once_with("home:0:root", ttl_seconds=300)
+        self.mock_pv.Browse.assert_not_called()
+        self.mock_cache_instance.set.assert_not_called()
+
+    def test_fetch_home_rails_cache_miss_stores_root(self):
+        self.mock_pv.Browse.return_value = SINGLE_RAIL_ROOT
+
+        home_module.fetch_home_rails(self.mock_pv)
+
+        self.mock_pv.Browse.assert_called_once_with('root')
+        self.mock_cache_instance.set.assert_called_once_with("home:0:root", SINGLE_RAIL_ROOT[0], 300)
 
-        rails = home_module.fetch_home_rails(self.mock_addon_instance, self.mock_cache_instance)
-        self.assertEqual(rails, cached_rails)
-        self.mock_cache_instance.get.assert_called_once()
-        self.mock_get_backend.assert_not_called()
+    def test_fetch_home_rails_mapping(self):
+        pv = self.mock_pv
+        pv.Browse.return_value = MIXED_RAILS_ROOT
 
-    # ...
-    # All other tests from the original file should be here
-    # ...
+        mock_addon = self.mock_addon
+        mock_addon.getLocalizedString.side_effect = {40002: "Movies"}.__getitem__
+        rails = home_module.fetch_home_rails(pv)
 
-if __name__ == '__main__':
-    unittest.main()
\ No newline at end of file
+        self.assertEqual(
+            [(rail["id"], rail["title"]) for rail in rails],
+            [("continue_watching", "Keep Watching"), ("movies", "Movies"), ("extra", "Extra")],
+        )
+        mock_addon.getLocalizedString.assert_called_once_with(40002)
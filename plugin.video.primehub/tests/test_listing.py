@@ -1,68 +1,77 @@
 import unittest
-from unittest.mock import MagicMock, patch
+from unittest.mock import Mock
 import sys
-import os
+from types import SimpleNamespace
 
-# Import and apply global patches for Kodi modules
-from .kodi_mocks import patch_kodi_modules_globally, MockXBMCGUI
+import pytest
 
-# Add the lib directory to sys.path
-sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../resources/lib')))
+# Kodi modules and the add-on root on sys.path are set up once by conftest.py
+from .kodi_mocks import capture_directory_items, swap_attr
 
 # Import the module under test
-import ui.listing as listing_module
-from backend.prime_api import BackendError, BackendUnavailable
-from preflight import PreflightError
+import resources.lib.ui.listing as listing_module
+import resources.lib.cache as cache_module
+from resources.lib.common import Globals
 
+# Shared, never-mutated fixtures
+CACHED_DATA = {"items": [{"asin": "c1", "title": "Cached Item"}], "next": None}
 
+
+class _AddonStub:
+    """The few Addon calls listing makes; far cheaper than a specced mock."""
+    getLocalizedString = staticmethod("LocalizedString_{}".format)
+    getSettingBool = staticmethod(lambda key: True)
+    getSettingInt = staticmethod(lambda key: 300)
+    getAddonInfo = staticmethod(lambda key: "/mock/path/to/fanart.jpg")
+    getSetting = staticmethod({"use_cache": "true", "cache_ttl": "300"}.get)
+
+
+# get_cache is patched once per file by conftest's ui_cache
+UI_MODULE = "resources.lib.ui.listing"
+
+
+@pytest.mark.usefixtures("ui_cache")
 class TestUIListing(unittest.TestCase):
 
     def setUp(self):
-        patch_kodi_modules_globally()
-        
-        # Patch external dependencies
-        self.patcher_get_backend = patch('ui.listing.get_backend')
-        self.mock_get_backend = self.patcher_get_backend.start()
-        self.mock_backend_instance = MagicMock()
-        self.mock_get_backend.return_value = self.mock_backend_instance
-
-        self.patcher_get_cache = patch('ui.listing.get_cache')
-        self.mock_get_cache = self.patcher_get_cache.start()
-        self.mock_cache_instance = MagicMock()
-        self.mock_get_cache.return_value = self.mock_cache_instance
-        
-        self.patcher_ensure_ready_or_raise = patch('ui.listing.ensure_ready_or_raise')
-        self.mock_ensure_ready_or_raise = self.patcher_ensure_ready_or_raise.start()
-        
-        # Mock xbmcplugin and xbmcgui from sys.modules
-        self.mock_xbmcplugin = sys.modules['xbmcplugin']
-        self.mock_xbmcgui = sys.modules['xbmcgui']
-        self.mock_xbmcaddon = sys.modules['xbmcaddon']
-
-        # Mock ListItem and Dialog for assertions
-        self.mock_list_item_instance = self.mock_xbmcgui.ListItem.return_value
-        self.mock_dialog_instance = self.mock_xbmcgui.Dialog.return_value
+        # listing reads settings through Globals().addon, so the stub alone
+        # covers xbmcaddon; directory listings land in a plain list.
+        swap_attr(self, Globals(), 'addon', _AddonStub)
+        cache_module.cache_settings.cache_clear()
+        cache_module._region.cache_clear()
+        self.directory_items = capture_directory_items(self)
 
+        self.mock_list_item_instance = sys.modules['xbmcgui'].ListItem.return_value
 
         # Create a mock context
-        self.mock_context = MagicMock()
-        self.mock_context.handle = 1
-        self.mock_context.build_url.side_effect = lambda **kwargs: "plugin_url?" + "&".join(f"{k}={v}" for k,v in kwargs.items())
-
-    def tearDown(self):
-        patch.stopall()
+        self.mock_context = SimpleNamespace(
+            handle=1,
+            base_url="plugin://plugin.video.primeflix/",
+            build_url=Mock(return_value="plugin_url"),
+        )
 
-    # ... (rest of the tests remain the same)
     def test_show_list_cache_hit(self):
-        cached_data = {"items": [{"asin": "c1", "title": "Cached Item"}], "next": None}
-        self.mock_cache_instance.get.return_value = cached_data
-        
-        listing_module.show_list(self.mock_context, "my_rail")
-        
-        self.mock_ensure_ready_or_raise.assert_called_once()
-        self.mock_cache_instance.get.assert_called_once_with("rail:my_rail:root", ttl_seconds=300)
-        self.mock_backend_instance.get_rail_items.assert_not_called()
-        self.mock_xbmcplugin.addDirectoryItems.assert_called_once()
-
-if __name__ == '__main__':
-    unittest.main()
\ No newline at end of file
+        self.mock_cache_instance.get.return_value = CACHED_DATA
+        pv = Mock()
+
+        listing_module.show_list(self.mock_context, pv, "my_rail")
+
+        self.mock_cache_instance.get.assert_called_once_with(
+            cache_module.cache_key("rail", "my_rail"), ttl_seconds=300)
+        self.assertEqual(cache_module.cache_key("rail", "my_rail"), "rail:0:my_rail")
+        pv.Browse.assert_not_called()
+        self.assertEqual(len(self.directory_items), 1)
+        self.assertEqual(len(self.directory_items[0][1]), 1)
+
+    def test_prefetch_rails_flushes_warmed_pages(self):
+        self.mock_cache_instance.get.return_value = None
+        pv = Mock()
+        pv.BrowseBatch.return_value = {"/rail": ([{"asin": "a1"}], None)}
+
+        thread = listing_module.prefetch_rails(self.mock_context, pv, ["/rail", None])
+        thread.join()
+
+        pv.BrowseBatch.assert_called_once_with(["/rail"])
+        self.mock_cache_instance.set.assert_called_once_with(
+            cache_module.cache_key("rail", "/rail"), {"items": [{"asin": "a1"}], "next": None, "next_url": None}, 300)
+        self.mock_cache_instance.flush.assert_called_once_with()
@@ -1,91 +1,73 @@
 import unittest
-from unittest.mock import MagicMock, patch
-import sys
-import os
+from unittest.mock import Mock, call, patch
 
-# Import and apply global patches for Kodi modules
-from .kodi_mocks import patch_kodi_modules_globally, MockXBMCGUI
-
-# Add the lib directory to sys.path
-sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../resources/lib')))
+# Kodi modules and the add-on root on sys.path are set up once by conftest.py
+from .kodi_mocks import MockXBMCGUI, swap_attr
 
 # Import the module under test
-import ui.login as login_module
-from backend.prime_api import AuthenticationError
+import resources.lib.ui.login as login_module
+from resources.lib.backend.prime_api import AuthenticationError
+from resources.lib.common import Globals
 
 class TestUILogin(unittest.TestCase):
 
-    def setUp(self):
-        # Reset mocks before each test
-        patch_kodi_modules_globally()
-        
-        # Patch get_backend
-        self.patcher_get_backend = patch('ui.login.get_backend')
-        self.mock_get_backend = self.patcher_get_backend.start()
-        self.mock_backend_instance = MagicMock()
-        self.mock_get_backend.return_value = self.mock_backend_instance
-
-        # Mock Dialog instance
-        self.mock_dialog_instance = MagicMock()
-        sys.modules['xbmcgui'].Dialog.return_value = self.mock_dialog_instance
+    @classmethod
+    def setUpClass(cls):
+        # Patch get_prime_video once for the class; setUp only resets it
+        patcher = patch('resources.lib.ui.login.get_prime_video', new_callable=Mock)
+        cls.mock_get_prime_video = patcher.start()
+        cls.addClassCleanup(patcher.stop)
+        cls.mock_pv = Mock()
+        cls.mock_get_prime_video.return_value = cls.mock_pv
+        cls.mock_dialog_instance = Mock()
 
-    def tearDown(self):
-        patch.stopall()
+    def setUp(self):
+        for mock in (self.mock_pv, self.mock_dialog_instance):
+            mock.reset_mock(return_value=True, side_effect=True)
+        # login talks to the user through Globals().dialog
+        swap_attr(self, Globals(), 'dialog', self.mock_dialog_instance)
 
     def test_show_login_screen_success(self):
         self.mock_dialog_instance.input.side_effect = ["testuser", "testpass"]
-        self.mock_backend_instance.login.return_value = True
+        self.mock_pv.login.return_value = True
 
         result = login_module.show_login_screen()
         self.assertTrue(result)
-        
-        self.assertEqual(self.mock_dialog_instance.input.call_count, 2)
-        self.mock_dialog_instance.input.assert_any_call("LocalizedString_32001")
-        self.mock_dialog_instance.input.assert_any_call("LocalizedString_32002", option=MockXBMCGUI.INPUT_PASSWORD)
-        self.mock_backend_instance.login.assert_called_once_with("testuser", "testpass")
-        self.mock_dialog_instance.ok.assert_called_once_with("LocalizedString_32003", "LocalizedString_32004")
-
-    def test_show_login_screen_cancel_username(self):
-        self.mock_dialog_instance.input.side_effect = ["", "testpass"] # Username empty
-        
-        result = login_module.show_login_screen()
-        self.assertFalse(result)
-        
-        self.mock_dialog_instance.input.assert_called_once_with("LocalizedString_32001")
-        self.mock_backend_instance.login.assert_not_called()
-        self.mock_dialog_instance.ok.assert_not_called()
-
-    def test_show_login_screen_cancel_password(self):
-        self.mock_dialog_instance.input.side_effect = ["testuser", ""] # Password empty
-        
-        result = login_module.show_login_screen()
-        self.assertFalse(result)
-        
-        self.assertEqual(self.mock_dialog_instance.input.call_count, 2)
-        self.mock_dialog_instance.input.assert_any_call("LocalizedString_32001")
-        self.mock_dialog_instance.input.assert_any_call("LocalizedString_32002", option=MockXBMCGUI.INPUT_PASSWORD)
-        self.mock_backend_instance.login.assert_not_called()
-        self.mock_dialog_instance.ok.assert_not_called()
-
-    def test_show_login_screen_backend_login_returns_false(self):
-        self.mock_dialog_instance.input.side_effect = ["testuser", "testpass"]
-        self.mock_backend_instance.login.return_value = False
-
-        result = login_module.show_login_screen()
-        self.assertFalse(result)
-        
-        self.mock_backend_instance.login.assert_called_once_with("testuser", "testpass")
-        self.mock_dialog_instance.ok.assert_called_once_with("LocalizedString_32005", "LocalizedString_32006")
-
-    def test_show_login_screen_backend_login_raises_authentication_error(self):
-        self.mock_dialog_instance.input.side_effect = ["testuser", "testpass"]
-        self.mock_backend_instance.login.side_effect = AuthenticationError("Some auth error")
-
-        result = login_module.show_login_screen()
-        self.assertFalse(result)
-        
-        self.mock_backend_instance.login.assert_called_once_with("testuser", "testpass")
-        self.mock_dialog_instance.ok.assert_called_once_with("LocalizedString_32005", "Some auth error")
 
-if __name__ == '__main__':
-    unittest.main()
\ No newline at end of file
+        # The whole dialog conversation, checked in one comparison
+        self.assertEqual(self.mock_dialog_instance.mock_calls, [
+            call.input("Username (email)"),
+            call.input("Password", option=MockXBMCGUI.INPUT_PASSWORD),
+            call.notification("Login Successful", "You are now logged in."),
+        ])
+        self.assertEqual(self.mock_pv.mock_calls, [call.login("testuser", "testpass")])
+
+    def test_show_login_screen_failure_paths(self):
+        # (inputs, login result or error, input calls, expected ok() args)
+        cases = [
+            (["", "testpass"], None, 1, None),  # username empty
+            (["testuser", ""], None, 2, None),  # password empty
+            (["testuser", "testpass"], False, 2, ("Login Failed", "Please check your credentials or logs.")),
+            (["testuser", "testpass"], AuthenticationError("Some auth error"), 2,
+             ("Login Error", "An unexpected error occurred: Some auth error")),
+        ]
+        for inputs, login_result, input_calls, ok_args in cases:
+            with self.subTest(inputs=inputs, login_result=login_result):
+                self.mock_dialog_instance.reset_mock(return_value=True, side_effect=True)
+                self.mock_pv.reset_mock(return_value=True, side_effect=True)
+                self.mock_dialog_instance.input.side_effect = inputs
+                if isinstance(login_result, Exception):
+                    self.mock_pv.login.side_effect = login_result
+                else:
+                    self.mock_pv.login.return_value = login_result
+
+                self.assertFalse(login_module.show_login_screen())
+
+                self.assertEqual(self.mock_dialog_instance.input.call_count, input_calls)
+                self.mock_dialog_instance.notification.assert_not_called()
+                if ok_args is None:
+                    self.mock_pv.login.assert_not_called()
+                    self.mock_dialog_instance.ok.assert_not_called()
+                else:
+                    self.mock_pv.login.assert_called_once_with("testuser", "testpass")
+                    self.mock_dialog_instance.ok.assert_called_once_with(*ok_args)
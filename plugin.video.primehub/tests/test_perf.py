@@ -1,38 +1,69 @@
+import functools
 import unittest
-from unittest.mock import MagicMock, patch
+from unittest.mock import Mock
 import sys
-import os
+from types import SimpleNamespace
 
-# Import and apply global patches for Kodi modules
-from .kodi_mocks import patch_kodi_modules_globally
-
-# Add the lib directory to sys.path
-sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../resources/lib')))
+# Kodi modules and the add-on root on sys.path are set up once by conftest.py
+from .kodi_mocks import swap_attr
 
 # Import the module under test
-import perf as perf_module
+import resources.lib.perf as perf_module
 
 
 class TestPerf(unittest.TestCase):
 
+    @classmethod
+    def setUpClass(cls):
+        # One fake clock for the whole class; setUp refills its ticks
+        cls._ticks = []
+        cls.addClassCleanup(setattr, perf_module, 'time', perf_module.time)
+        perf_module.time = SimpleNamespace(perf_counter=functools.partial(cls._ticks.pop, 0))
+        # The log and Addon doubles are also built once and reset per test
+        cls.mock_log = Mock()
+        cls.mock_addon = Mock()
+        cls.mock_addon_class = Mock(return_value=cls.mock_addon)
+
     def setUp(self):
-        patch_kodi_modules_globally()
+        self._ticks[:] = [0.0, 1.0]
+        self.mock_log.reset_mock()
+        self.mock_addon.reset_mock(return_value=True, side_effect=True)
+        self.mock_addon_class.reset_mock()
         self.mock_xbmc = sys.modules['xbmc']
-        self.mock_addon = sys.modules['xbmcaddon'].Addon.return_value
-        perf_module._perf_enabled_cache = None # Clear cache
+        swap_attr(self, perf_module.xbmc, 'log', self.mock_log)
+        swap_attr(self, perf_module.xbmcaddon, 'Addon', self.mock_addon_class)
+        perf_module.is_perf_logging_enabled.cache_clear()
+        self.addCleanup(perf_module.is_perf_logging_enabled.cache_clear)
 
-    def tearDown(self):
-        patch.stopall()
-
-    # ... (rest of the tests remain the same)
     def test_is_perf_logging_enabled_true(self):
         self.mock_addon.getSettingBool.return_value = True
         self.assertTrue(perf_module.is_perf_logging_enabled())
         self.mock_addon.getSettingBool.assert_called_once_with("perf_logging")
 
-    # ...
-    # All other tests from the original file should be here
-    # ...
+    def test_is_perf_logging_enabled_caches_result(self):
+        self.mock_addon.getSettingBool.return_value = True
+        self.assertTrue(perf_module.is_perf_logging_enabled())
+        self.assertTrue(perf_module.is_perf_logging_enabled())
+        self.mock_addon.getSettingBool.assert_called_once_with("perf_logging")
+
+    def test_timed_logs_when_enabled(self):
+        self.mock_addon.getSettingBool.return_value = True
+
+        result = perf_module.timed("label")(lambda: "ok")()
+
+        self.assertEqual(result, "ok")
+        self.mock_log.assert_called_with("[PrimeFlix] label finished in 1000.00 ms", self.mock_xbmc.LOGDEBUG)
+
+    def test_timed_no_log_when_disabled(self):
+        self.mock_addon.getSettingBool.return_value = False
+
+        perf_module.timed("label")(lambda: None)()
+
+        self.mock_log.assert_not_called()
+
+    def test_timed_logs_warning_on_threshold_exceeded(self):
+        self.mock_addon.getSettingBool.return_value = False
+
+        perf_module.timed("label", warn_threshold_ms=500)(lambda: None)()
 
-if __name__ == '__main__':
-    unittest.main()
\ No newline at end of file
+        self.mock_log.assert_called_once_with("[PrimeFlix] label finished in 1000.00 ms", self.mock_xbmc.LOGWARNING)
@@ -1,66 +1,121 @@
 import unittest
-from unittest.mock import MagicMock, patch
+from unittest.mock import ANY, Mock
 import sys
-import os
+from types import MappingProxyType, SimpleNamespace
 
-# Import and apply global patches for Kodi modules
-from .kodi_mocks import patch_kodi_modules_globally
+import pytest
 
-# Add the lib directory to sys.path
-sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../resources/lib')))
+# Kodi modules and the add-on root on sys.path are set up once by conftest.py
+from .kodi_mocks import swap_attr
 
 # Import the module under test
-import ui.playback as playback_module
-from backend.prime_api import BackendError, BackendUnavailable, Playable
-from preflight import PreflightError
+import resources.lib.ui.playback as playback_module
+from resources.lib.backend.prime_api import Playable
+
+# Shared, never-mutated fixtures
+MOCK_PLAYABLE = Playable(
+    url="http://mock.manifest/url.mpd",
+    manifest_type="mpd",
+    license_key="http://mock.license/key",
+    headers={"User-Agent": "MockUserAgent"},
+    metadata={"title": "Mock Title", "plot": "Mock Plot"}
+)
+
+# GetStream payloads and the Playable each should normalize to
+NORMALIZE_CASES = (
+    (
+        MappingProxyType({
+            "manifest_url": "http://mock.manifest/url.mpd",
+            "license_url": "http://mock.license/key",
+            "headers": {"User-Agent": "MockUserAgent"},
+            "title": "Mock Title",
+        }),
+        Playable(
+            url="http://mock.manifest/url.mpd",
+            license_key="http://mock.license/key",
+            headers={"User-Agent": "MockUserAgent"},
+            metadata={"title": "Mock Title"},
+        ),
+    ),
+    (
+        MappingProxyType({"manifest_url": "http://mock.manifest/url.mpd"}),
+        Playable(url="http://mock.manifest/url.mpd", metadata={"title": "Playable for mock_asin"}),
+    ),
+)
+
+
+# A pure function: a plain parametrized test skips the TestCase machinery.
+@pytest.mark.parametrize("stream_info, expected", NORMALIZE_CASES, ids=["full", "minimal"])
+def test_normalize_playback(stream_info, expected):
+    assert playback_module._normalize_playback("mock_asin", stream_info) == expected
+
+
+def test_play_failure_drops_cached_stream(monkeypatch):
+    cache = Mock()
+    cache.get.return_value = {"title": "no manifest_url"}  # a cached, unusable stream
+    monkeypatch.setattr(playback_module, "get_cache", Mock(return_value=cache))
+    monkeypatch.setattr(playback_module, "cache_settings", Mock(return_value=(True, 300)))
+    monkeypatch.setattr(playback_module, "cache_key", lambda kind, name: f"{kind}:0:{name}")
+    notify = Mock()
+    monkeypatch.setattr(playback_module, "notify", notify)
+
+    playback_module.play(SimpleNamespace(handle=1), Mock(), "mock_asin")
+
+    cache.delete.assert_called_once_with("stream:0:mock_asin")
+    notify.assert_called_once()
 
 
 class TestUIPlayback(unittest.TestCase):
 
+    @classmethod
+    def setUpClass(cls):
+        # Built once; setUp resets them and swaps them in directly
+        cls.mock_pv = Mock()
+        cls.mock_set_resolved_url = Mock()
+
     def setUp(self):
-        patch_kodi_modules_globally()
-        
-        # Patch external dependencies
-        self.patcher_get_backend = patch('ui.playback.get_backend')
-        self.mock_get_backend = self.patcher_get_backend.start()
-        self.mock_backend_instance = MagicMock()
-        self.mock_get_backend.return_value = self.mock_backend_instance
-
-        self.patcher_ensure_ready_or_raise = patch('ui.playback.ensure_ready_or_raise')
-        self.mock_ensure_ready_or_raise = self.patcher_ensure_ready_or_raise.start()
-        
+        for mock in (self.mock_pv, self.mock_set_resolved_url):
+            mock.reset_mock(return_value=True, side_effect=True)
+        # Caching off: play() goes straight to pv.GetStream
+        swap_attr(self, playback_module, 'cache_settings', Mock(return_value=(False, 0)))
+
         # Mock xbmcplugin and xbmcgui from sys.modules
         self.mock_xbmcplugin = sys.modules['xbmcplugin']
+        swap_attr(self, self.mock_xbmcplugin, 'setResolvedUrl', self.mock_set_resolved_url)
         self.mock_xbmcgui = sys.modules['xbmcgui']
-        
+
         # Mock ListItem
         self.mock_list_item_instance = self.mock_xbmcgui.ListItem.return_value
-        
-        # Create a mock context
-        self.mock_context = MagicMock()
-        self.mock_context.handle = 1
 
-    def tearDown(self):
-        patch.stopall()
+        # Create a mock context
+        self.mock_context = SimpleNamespace(handle=1)
 
-    # ... (rest of the tests remain the same)
     def test_play_success(self):
-        mock_playable = Playable(
-            url="http://mock.manifest/url.mpd",
-            manifest_type="mpd",
-            license_key="http://mock.license/key",
-            headers={"User-Agent": "MockUserAgent"},
-            metadata={"title": "Mock Title", "plot": "Mock Plot"}
-        )
-        self.mock_backend_instance.get_playable.return_value = mock_playable
-        
-        playback_module.play(self.mock_context, "mock_asin")
-        
-        self.mock_ensure_ready_or_raise.assert_called_once()
-        self.mock_backend_instance.get_playable.assert_called_once_with("mock_asin")
-        self.mock_list_item_instance.setInfo.assert_called_once_with("video", mock_playable.metadata)
-        self.mock_list_item_instance.setProperty.assert_any_call("inputstream.adaptive.manifest_type", "mpd")
-        self.mock_xbmcplugin.setResolvedUrl.assert_called_once_with(self.mock_context.handle, True, self.mock_list_item_instance)
-
-if __name__ == '__main__':
-    unittest.main()
\ No newline at end of file
+        self.mock_pv.GetStream.return_value = (True, NORMALIZE_CASES[0][0])
+
+        playback_module.play(self.mock_context, self.mock_pv, "mock_asin")
+
+        self.mock_pv.GetStream.assert_called_once_with("mock_asin")
+        self.mock_set_resolved_url.assert_called_once_with(self.mock_context.handle, True, ANY)
+        list_item = self.mock_set_resolved_url.call_args.args[2]
+        self.assertIs(list_item, self.mock_list_item_instance)
+        self.mock_xbmcgui.ListItem.assert_called_once_with(label="Mock Title")
+        props = list_item.setProperties.call_args.args[0]
+        self.assertEqual(props["inputstream.adaptive.manifest_type"], "mpd")
+        self.assertEqual(props["inputstream.adaptive.license_key"], "http://mock.license/key")
+
+    def test_build_list_item_with_license(self):
+        playback_module._build_list_item(MOCK_PLAYABLE)
+
+        # The mock ListItem has setProperties, so the whole bag arrives in one call
+        actual = set(self.mock_list_item_instance.setProperties.call_args.args[0].items())
+        expected = {
+            ("inputstream", "inputstream.adaptive"),
+            ("inputstream.adaptive.manifest_type", "mpd"),
+            ("inputstream.adaptive.license_type", "com.widevine.alpha"),
+            ("inputstream.adaptive.license_key", "http://mock.license/key"),
+            ("inputstream.adaptive.stream_headers", "User-Agent=MockUserAgent"),
+        }
+        self.assertLessEqual(expected, actual)
+        self.mock_list_item_instance.setProperty.assert_not_called()
+        self.assertEqual(self.mock_list_item_instance.setMimeType.call_args_list, [(("application/dash+xml",),)])
@@ -1,66 +1,104 @@
-import unittest
-from unittest.mock import MagicMock, patch
-import sys
-import os
+import time
+from types import MappingProxyType, SimpleNamespace
+from unittest.mock import patch
 
-from .kodi_mocks import patch_kodi_modules_globally
-patch_kodi_modules_globally()
+import pytest
 
-sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../resources/lib')))
-from backend.prime_api import PrimeVideo
+# Kodi modules and the add-on root on sys.path are set up once by conftest.py.
+# backend.prime_api is imported by the fixtures, so collecting this file does
+# not pull in the network stack.
 
-# A mock JSON response for GetPlaybackResources, based on Sandmann79 analysis
-MOCK_STREAM_JSON = {
-    "playbackUrls": {
+# A mock JSON response for GetPlaybackResources, based on Sandmann79 analysis.
+# Read-only all the way down: every test shares this one instance.
+MOCK_STREAM_JSON = MappingProxyType({
+    "playbackUrls": MappingProxyType({
         "mainManifestUrl": "http://mock.playback/manifest.mpd"
-    },
-    "license": {
+    }),
+    "license": MappingProxyType({
         "licenseUrl": "http://mock.license/server"
-    },
-    "audioTracks": [
-        {"audioTrackId": "A1", "languageCode": "en_US"}
-    ],
-    "timedTextTracks": [
-        {"languageCode": "en_US", "type": "SUBTITLE", "url": "http://mock.subtitle/en.srt"}
-    ]
-}
-
-class TestPrimeVideo(unittest.TestCase):
-    def setUp(self):
-        # Reset the singleton for each test
-        if PrimeVideo in PrimeVideo._instances:
-            del PrimeVideo._instances[PrimeVideo]
-        self.pv = PrimeVideo()
-
-    @patch('backend.prime_api.net.getURLData')
-    def test_get_stream_success(self, mock_get_url_data):
-        """Tests that GetStream successfully parses a valid JSON response."""
-        mock_get_url_data.return_value = (True, MOCK_STREAM_JSON)
-        
-        success, stream_info = self.pv.GetStream("B012345")
-        
-        self.assertTrue(success)
-        self.assertEqual(stream_info['manifest_url'], "http://mock.playback/manifest.mpd")
-        self.assertEqual(stream_info['license_url'], "http://mock.license/server")
-        self.assertEqual(len(stream_info['audio_tracks']), 1)
-        self.assertEqual(stream_info['audio_tracks'][0]['languageCode'], "en_US")
-        self.assertEqual(len(stream_info['subtitle_tracks']), 1)
-
-    @patch('backend.prime_api.net.getURLData')
-    def test_get_stream_failure_on_api_error(self, mock_get_url_data):
-        """Tests that GetStream returns False when the API call fails."""
-        mock_get_url_data.return_value = (False, "API Error")
-        success, data = self.pv.GetStream("B012345")
-        self.assertFalse(success)
-        self.assertEqual(data, "API Error")
-
-    @patch('backend.prime_api.net.getURLData')
-    def test_get_stream_failure_on_bad_json(self, mock_get_url_data):
-        """Tests that GetStream returns False when the JSON is missing required keys."""
-        mock_get_url_data.return_value = (True, {"error": "bad data"})
-        success, data = self.pv.GetStream("B012345")
-        self.assertFalse(success)
-        self.assertIn("Failed to parse stream data", data)
-
-if __name__ == '__main__':
-    unittest.main()
+    }),
+    "audioTracks": (
+        MappingProxyType({"audioTrackId": "A1", "languageCode": "en_US"}),
+    ),
+    "timedTextTracks": (
+        MappingProxyType({"languageCode": "en_US", "type": "SUBTITLE", "url": "http://mock.subtitle/en.srt"}),
+    ),
+})
+
+@pytest.fixture(scope="module")
+def get_url_data():
+    """``net.getURLData`` replaced once for the module by a plain stub.
+
+    Tests only need a canned ``(success, data)`` reply, so the stub returns
+    ``.response`` rather than going through mock call recording.
+    """
+    stub = SimpleNamespace(response=None)
+    with patch('resources.lib.backend.prime_api.net.getURLData', lambda *args, **kwargs: stub.response):
+        yield stub
+
+
+@pytest.fixture(scope="module")
+def _pv_instance():
+    """The PrimeVideo singleton, constructed once for the module."""
+    from resources.lib.backend.prime_api import PrimeVideo
+    return PrimeVideo()
+
+
+@pytest.fixture
+def pv(_pv_instance, get_url_data):
+    """Shared PrimeVideo with its per-test state reset.
+
+    ``_catalog`` and the ``_responses`` memo are the only state tests may
+    mutate; anything else a test changes must be reset here too.
+    """
+    get_url_data.response = None
+    _pv_instance._catalog = {}
+    _pv_instance._responses.clear()
+    return _pv_instance
+
+
+def test_get_stream_success(pv, get_url_data):
+    """Tests that GetStream successfully parses a valid JSON response."""
+    get_url_data.response = (True, MOCK_STREAM_JSON)
+
+    success, stream_info = pv.GetStream("B012345")
+
+    assert success
+    assert stream_info['manifest_url'] == "http://mock.playback/manifest.mpd"
+    assert stream_info['license_url'] == "http://mock.license/server"
+    assert len(stream_info['audio_tracks']) == 1
+    assert stream_info['audio_tracks'][0]['languageCode'] == "en_US"
+    assert len(stream_info['subtitle_tracks']) == 1
+
+
+@pytest.mark.parametrize("response, message", [
+    ((False, "API Error"), "API Error"),  # API call fails
+    ((True, MappingProxyType({"error": "bad data"})), "Failed to parse stream data"),  # required keys missing
+], ids=["api_error", "bad_json"])
+def test_get_stream_failure(pv, get_url_data, response, message):
+    """Tests that GetStream returns False and the reason on failure."""
+    get_url_data.response = response
+    success, data = pv.GetStream("B012345")
+    assert not success
+    assert message in data
+
+
+def test_search_memoized(pv):
+    """A repeated query is served from the memo within its TTL."""
+    page = ([{"asin": "B012345"}], None)
+    with patch.object(pv, "_search", return_value=page) as search:
+        assert pv.Search("query") is page
+        assert pv.Search("query") is page
+    search.assert_called_once_with("query")
+
+
+def test_browse_batch_fetches_only_misses(pv):
+    """BrowseBatch fetches each uncached path once and fills the memo."""
+    pv._catalog = {"root": {}}
+    cached = ([{"asin": "B0"}], None)
+    pv._responses["browse:/cached"] = (time.monotonic(), cached)
+    with patch.object(pv, "_browse", side_effect=lambda path: ([{"asin": path}], None)) as browse:
+        pages = pv.BrowseBatch(["/cached", "/a", None, "/a"])
+    assert pages == {"/cached": cached, "/a": ([{"asin": "/a"}], None)}
+    browse.assert_called_once_with("/a")
+    assert pv.Browse("/a") == ([{"asin": "/a"}], None)
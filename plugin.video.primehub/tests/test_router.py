@@ -1,57 +1,97 @@
-import unittest
-from unittest.mock import MagicMock, patch
 import sys
-import os
+import unittest
+from unittest.mock import ANY, Mock
+
+# Kodi modules and the add-on root on sys.path are set up once by conftest.py
+from .kodi_mocks import swap_attr
+
+# router pulls in every UI module and the backend; import it once, when the
+# tests run, rather than while collecting this file.
+router_module = None
+dispatch = None
 
-# Import and apply global patches for Kodi modules
-from .kodi_mocks import patch_kodi_modules_globally
 
-# Add the lib directory to sys.path
-sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../resources/lib')))
+def setUpModule():
+    global router_module, dispatch
+    import resources.lib.router as router_module
+    dispatch = router_module.dispatch
+
+
+# Names in router replaced for every test
+_PATCHED = ('home', 'listing', 'playback', 'diagnostics', 'login', 'show_preflight_error', 'get_prime_video',
+            'flush_cache')
+# dispatch only reads the handle from argv; the query is passed in
+_ARGV = ['default.py', '1', '']
 
-# Import the module under test
-import router
-from router import dispatch, PluginContext
-from preflight import PreflightError
 
 class TestRouter(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        # Plain Mocks built once; setUp resets them and swaps them in directly
+        cls._doubles = {name: Mock() for name in _PATCHED}
+
     def setUp(self):
-        patch_kodi_modules_globally()
-        
-        # Start and manage patches manually
-        self.patchers = {
-            'home': patch('router.home').start(),
-            'listing': patch('router.listing').start(),
-            'playback': patch('router.playback').start(),
-            'login': patch('router.login').start(),
-            'show_preflight_error': patch('router.show_preflight_error').start(),
-            'get_prime_video': patch('router.get_prime_video').start()
-        }
+        self.patchers = self._doubles
+        for name, double in self._doubles.items():
+            double.reset_mock(return_value=True, side_effect=True)
+            swap_attr(self, router_module, name, double)
         self.mock_pv = self.patchers['get_prime_video'].return_value
+        swap_attr(self, sys, 'argv', _ARGV)
 
-    def tearDown(self):
-        patch.stopall()
-
-    @patch('sys.argv', ['default.py', '1', ''])
-    def test_dispatch_default_action(self):
-        dispatch("plugin://plugin.video.primeflix/", "")
-        self.patchers['home'].show_home.assert_called_once_with(unittest.mock.ANY, self.mock_pv)
+    def test_dispatch_routes_actions(self):
+        # (query string, patched module, handler, args after context and pv)
+        cases = [
+            ("", 'home', 'show_home', ()),
+            ("action=list&rail_id=my_rail", 'listing', 'show_list', ("my_rail",)),
+            ("action=play&asin=B012345", 'playback', 'play', ("B012345",)),
+            ("action=search&query=my_query", 'listing', 'show_search', ("my_query",)),
+            ("action=diagnostics", 'diagnostics', 'show_results', ()),
+        ]
+        for params, module, handler, args in cases:
+            with self.subTest(params=params):
+                for double in self._doubles.values():
+                    double.reset_mock()
+                dispatch("plugin://plugin.video.primeflix/", params)
+                getattr(self.patchers[module], handler).assert_called_once_with(ANY, self.mock_pv, *args)
 
-    @patch('sys.argv', ['default.py', '1', '?action=list&rail_id=my_rail'])
-    def test_dispatch_list_action(self):
-        dispatch("plugin://plugin.video.primeflix/", "action=list&rail_id=my_rail")
-        self.patchers['listing'].show_list.assert_called_once_with(unittest.mock.ANY, self.mock_pv, "my_rail")
+    def test_dispatch_routes_login(self):
+        dispatch("plugin://plugin.video.primeflix/", "action=login")
+        self.patchers['login'].show_login_screen.assert_called_once_with()
+        self.patchers['home'].show_home.assert_not_called()
 
-    @patch('sys.argv', ['default.py', '1', '?action=play&asin=B012345'])
-    def test_dispatch_play_action(self):
-        dispatch("plugin://plugin.video.primeflix/", "action=play&asin=B012345")
-        self.patchers['playback'].play.assert_called_once_with(unittest.mock.ANY, self.mock_pv, "B012345")
+    def test_dispatch_cache_to_disc(self):
+        end_of_directory = swap_attr(self, router_module.xbmcplugin, 'endOfDirectory', Mock())
+        for params, cache_to_disc in (("action=list&rail_id=x", True), ("action=diagnostics", False)):
+            with self.subTest(params=params):
+                end_of_directory.reset_mock()
+                self.patchers['flush_cache'].reset_mock()
+                dispatch("plugin://plugin.video.primeflix/", params)
+                end_of_directory.assert_called_once_with(1, cacheToDisc=cache_to_disc)
+                self.patchers['flush_cache'].assert_called_once_with()
 
-    @patch('sys.argv', ['default.py', '1', '?action=search&query=my_query'])
-    def test_dispatch_search_action(self):
-        # Assuming show_search is in listing.py
-        dispatch("plugin://plugin.video.primeflix/", "action=search&query=my_query")
-        self.patchers['listing'].show_search.assert_called_once_with(unittest.mock.ANY, self.mock_pv, "my_query")
+    def test_build_url_drops_none_values(self):
+        context = router_module.PluginContext("plugin://plugin.video.primeflix/", 1)
+        self.assertEqual(context.build_url(), "plugin://plugin.video.primeflix/")
+        self.assertEqual(context.build_url(action="list", rail_id=None),
+                         "plugin://plugin.video.primeflix/?action=list")
+        self.assertEqual(context.build_url(action="list", rail_id="/a b"),
+                         "plugin://plugin.video.primeflix/?action=list&rail_id=%2Fa+b")
 
-if __name__ == '__main__':
-    unittest.main()
\ No newline at end of file
+    def test_dispatch_reports_preflight_errors(self):
+        end_of_directory = swap_attr(self, router_module.xbmcplugin, 'endOfDirectory', Mock())
+        # (query string, patched module, handler that raises)
+        cases = [
+            ("action=list&rail_id=x", 'listing', 'show_list'),
+            ("action=play&asin=y", 'playback', 'play'),
+            ("action=search&query=z", 'listing', 'show_search'),
+        ]
+        for params, module, handler in cases:
+            with self.subTest(params=params):
+                for double in self._doubles.values():
+                    double.reset_mock(return_value=True, side_effect=True)
+                end_of_directory.reset_mock()
+                error = router_module.PreflightError("not ready")
+                getattr(self.patchers[module], handler).side_effect = error
+                dispatch("plugin://plugin.video.primeflix/", params)
+                self.patchers['show_preflight_error'].assert_called_once_with(error)
+                end_of_directory.assert_called_once_with(1, succeeded=False)